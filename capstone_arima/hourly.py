@@ -0,0 +1,104 @@
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMRegressor
+
+from capstone_common.features import API_WEATHER_COLUMNS
+from capstone_common.metrics import score_forecasts
+from model_registry import hash_training_data, site_registry
+
+# -------------------------------
+# 시간 단위 발전량 예측
+# -------------------------------
+# 24개 시간대를 각각 학습하지 않고, 시각(hour)을 피처로 넣은 LightGBM 모델 하나로
+# 모든 시간대를 한 번에 학습하고 24×N개 시간을 한 번의 predict로 예측합니다.
+# 피처: measurement의 예보 기상값(기상청 발전량 예보 표), 날씨 API 시간별 예보(wx_*), 달력
+# 예측 대상 시각의 예보는 피처 저장소의 미래 시각 행(내일 예보 · 날씨 API 예보)을 그대로 사용하고,
+# 값이 없는 칸만 열마다 마지막 예보일의 같은 시각 값으로 대체합니다.
+# (하루 중 MIN_PROFILE_HOURS시간 이상 값이 있는 날만 대체 기준으로 사용 — SARIMA 일별 예보는 0시 한 행만 저장됨)
+# 학습 라벨 구간에서 wx_* 값이 없는 시각(날씨 API 저장 이전)은 NaN 그대로 두고 LightGBM의 결측 처리에 맡깁니다.
+
+HOURLY_PARAMS = {"n_estimators": 300, "learning_rate": 0.05, "num_leaves": 31, "verbose": -1}
+HOURLY_HORIZON_DAYS = 1
+HOURS = 24
+TARGET_COLUMN = "power_mw"
+WEATHER_COLUMNS = ['forecast_irradiance_wm2', 'forecast_temperature_c', 'forecast_wind_speed_ms']
+API_WEATHER_FEATURES = [f'wx_{column}' for column in API_WEATHER_COLUMNS]
+FORECAST_COLUMNS = WEATHER_COLUMNS + API_WEATHER_FEATURES
+HOURLY_FEATURES = FORECAST_COLUMNS + ['hour', 'dayofweek', 'month', 'dayofyear']
+MIN_PROFILE_HOURS = 12
+
+# 사이트별 시간 단위 모델 저장소 (cache/models/lgbm_hourly_<site_id>/)
+def hourly_registry(site_id):
+    return site_registry("lgbm_hourly", site_id)
+
+def add_calendar_features(frame):
+    index = frame.index
+    frame['hour'] = index.hour
+    frame['dayofweek'] = index.dayofweek
+    frame['month'] = index.month
+    frame['dayofyear'] = index.dayofyear
+    return frame
+
+# hourly: 공용 피처 저장소의 시간별 프레임 (정시 격자, 실측/예보 + 달력 피처)
+# 라벨: 오늘 이전(수집이 끝난 날)의 시간별 발전량
+def hourly_training_set(hourly, today):
+    labelled = hourly[hourly.index < today].dropna(subset=[TARGET_COLUMN] + WEATHER_COLUMNS)
+    return labelled[HOURLY_FEATURES], labelled[TARGET_COLUMN]
+
+def hourly_forecast_features(hourly, start, days=HOURLY_HORIZON_DAYS):
+    target_index = pd.date_range(start, periods=HOURS * days, freq='h')
+    weather = hourly[FORECAST_COLUMNS].reindex(target_index)
+
+    for column in FORECAST_COLUMNS:
+        if not weather[column].isna().any():
+            continue
+        known = hourly[column].dropna()
+        days_known = known.groupby(known.index.normalize()).size()
+        full_days = days_known.index[days_known >= MIN_PROFILE_HOURS]
+        if full_days.empty:
+            continue
+        last_day = known[known.index.normalize() == full_days.max()]
+        profile = last_day.groupby(last_day.index.hour).mean()
+        weather[column] = weather[column].fillna(pd.Series(profile.reindex(target_index.hour).to_numpy(),
+                                                           index=target_index))
+    return add_calendar_features(weather)[HOURLY_FEATURES]
+
+# 학습 데이터가 바뀌지 않았으면 저장된 모델 재사용 (반환: 모델, 버전)
+def ensure_hourly_model(train_X, train_y, registry):
+    with registry.lock:
+        model, meta = registry.load_current()
+        data_hash = hash_training_data(train_X, train_y)
+        if model is not None and meta["features"] == list(train_X.columns) and meta["data_hash"] == data_hash:
+            return model, meta["version"]
+
+        started = perf_counter()
+        model = LGBMRegressor(**HOURLY_PARAMS)
+        model.fit(train_X, train_y)
+        entry = registry.register(model, {
+            "features": list(train_X.columns),
+            "data_hash": data_hash,
+            "labelled_until": str(train_X.index.max()),
+            "n_rows": int(len(train_X)),
+            "kind": "full"
+        }, perf_counter() - started)
+        print(f"✅ 시간 단위 모델 학습 ({registry.name}): v{entry['version']} ({entry['n_rows']}시간, {entry['fit_seconds']}s)")
+        return model, entry["version"]
+
+# 반환: 시각별 예측 Series (음수는 0으로)
+def predict_hourly(model, features, registry):
+    started = perf_counter()
+    predicted = np.clip(model.predict(features), 0, None)
+    registry.record_prediction(perf_counter() - started)
+    return pd.Series(predicted, index=features.index, name="predicted_mw")
+
+# 저장된 시간별 예측/실측(target_at, predicted_mw, actual_mw)을 일 × 시각 배열로 바꿔 시각별 지표 계산
+def score_hourly(frame):
+    frame = frame.assign(day=frame['target_at'].dt.normalize(), hour=frame['target_at'].dt.hour)
+    actuals = frame.pivot(index='day', columns='hour', values='actual_mw').reindex(columns=range(HOURS))
+    predicted = frame.pivot(index='day', columns='hour', values='predicted_mw').reindex(columns=range(HOURS))
+    scores = score_forecasts(actuals.to_numpy(dtype=np.float64), predicted.to_numpy(dtype=np.float64))
+    per_hour = scores["per_horizon"].rename(columns={"horizon": "hour"})
+    per_hour["hour"] -= 1
+    return per_hour, scores["overall"]
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+import joblib
+import pandas as pd
+
+from capstone_common.filelock import FileLock
+
+# -------------------------------
+# 학습 모델 저장소
+# -------------------------------
+# 학습된 모델을 버전별 파일로 저장하고, index.json에 피처 구성·학습 데이터 해시·학습 구간·소요 시간을 기록합니다.
+# 최신 모델은 메모리에 올려 두어 예측 요청마다 파일을 다시 읽지 않습니다.
+# 저장소마다(사이트별) 잠금 파일(.lock)을 두어 여러 프로세스가 동시에 학습 · 등록해도 버전과 index.json이 꼬이지 않게 합니다.
+
+REGISTRY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "models")
+TIMING_HISTORY = 50
+
+def hash_training_data(X, y):
+    digest = hashlib.sha256()
+    digest.update(",".join(X.columns).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(X, index=True).values.tobytes())
+    digest.update(pd.util.hash_pandas_object(y, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    def __init__(self, name, root=REGISTRY_DIR):
+        self.name = name
+        self.root = os.path.join(root, name)
+        self.lock = FileLock(os.path.join(self.root, ".lock"))  # 프로세스 간 잠금 (같은 프로세스에서는 재진입 가능)
+        self._loaded = None  # (version, model)
+        os.makedirs(self.root, exist_ok=True)
+
+    @property
+    def _index_path(self):
+        return os.path.join(self.root, "index.json")
+
+    def _read_index(self):
+        if not os.path.exists(self._index_path):
+            return {"current": None, "versions": [], "timings": {"fit": [], "predict": []}}
+        with open(self._index_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_index(self, index):
+        tmp_path = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._index_path)
+
+    def current_meta(self):
+        with self.lock:
+            index = self._read_index()
+            if index["current"] is None:
+                return None
+            return next(v for v in index["versions"] if v["version"] == index["current"])
+
+    def load_current(self):
+        with self.lock:
+            meta = self.current_meta()
+            if meta is None:
+                return None, None
+            if self._loaded is None or self._loaded[0] != meta["version"]:
+                self._loaded = (meta["version"], joblib.load(os.path.join(self.root, meta["file"])))
+            return self._loaded[1], meta
+
+    # meta: features, data_hash, labelled_until, kind(full/incremental) 등 학습 정보
+    def register(self, model, meta, fit_seconds):
+        with self.lock:
+            index = self._read_index()
+            version = (index["current"] or 0) + 1
+            file_name = f"{self.name}_v{version}.pkl"
+            tmp_path = os.path.join(self.root, f"{file_name}.{os.getpid()}.tmp")
+            joblib.dump(model, tmp_path)
+            os.replace(tmp_path, os.path.join(self.root, file_name))
+
+            entry = dict(meta, version=version, file=file_name,
+                         created_at=datetime.now().isoformat(timespec="seconds"),
+                         fit_seconds=round(fit_seconds, 3))
+            index["versions"].append(entry)
+            index["current"] = version
+            self._append_timing(index, "fit", fit_seconds)
+            self._write_index(index)
+            self._loaded = (version, model)
+            return entry
+
+    def record_prediction(self, seconds):
+        with self.lock:
+            index = self._read_index()
+            self._append_timing(index, "predict", seconds)
+            self._write_index(index)
+
+    def _append_timing(self, index, kind, seconds):
+        history = index["timings"].setdefault(kind, [])
+        history.append({"at": datetime.now().isoformat(timespec="seconds"), "seconds": round(seconds, 4)})
+        del history[:-TIMING_HISTORY]
+
+    def timings(self):
+        with self.lock:
+            return self._read_index()["timings"]
+
+
+# 사이트별 저장소: <name>_<site_id> 디렉터리를 사용하고, 프로세스 안에서는 하나의 인스턴스를 공유
+_SITE_REGISTRIES = {}
+_SITE_REGISTRIES_LOCK = threading.Lock()
+
+def site_registry(name, site_id):
+    key = f"{name}_{site_id}"
+    with _SITE_REGISTRIES_LOCK:
+        if key not in _SITE_REGISTRIES:
+            _SITE_REGISTRIES[key] = ModelRegistry(key)
+        return _SITE_REGISTRIES[key]
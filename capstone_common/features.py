@@ -0,0 +1,271 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+from datetime import datetime
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+if __package__ in (None, ""):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from capstone_common.db import connect
+from capstone_common.filelock import FileLock
+from capstone_common.measurement_cache import load_measurements_incremental
+from capstone_common.sites import get_site
+
+# -------------------------------
+# 공용 피처 저장소 (ARIMA(LightGBM) / SARIMA 서비스 공용)
+# -------------------------------
+# 일별 · 시간별 피처 프레임을 수집이 끝날 때마다 한 번 만들어 디스크에 저장하고, 두 서비스가 같은 프레임을 읽습니다.
+# - 일별 원천: measurement_daily 집계 테이블 (rollups.py), 시간별 원천: measurement 증분 캐시 + hourly_weather_forecast
+# - 피처: 일 발전량(누적 최대 - 최소) · 시간별 발전량 증분, 예보 기상값, 달력, 지연(lag) 값 — 모두 열 단위 연산으로 계산
+# - 버전: FEATURE_VERSION(피처 정의)별 디렉터리 아래에 스냅샷을 만들고 current.json이 최신 스냅샷을 가리킴
+#   원천 지문(집계 행 수 · 마지막 갱신 시각, 시간별 날씨 마지막 발표 시각)이 같으면 다시 만들지 않음
+# - 저장 형식: 열마다 .npy 파일, 스냅샷은 KEEP_SNAPSHOTS개까지 유지
+# - 동시 실행: 사이트 디렉터리의 잠금 파일(.lock)로 스냅샷 생성을 한 번에 한 프로세스만 하고 (뒤 프로세스는 지문이 같으면 재사용),
+#   스냅샷은 프로세스별 임시 디렉터리에 쓴 뒤 이름을 바꿈
+# 피처 정의를 바꾸면 FEATURE_VERSION을 올립니다 (기존 스냅샷은 사용하지 않고 새로 만듦).
+# 사용법 (저장소 루트에서):
+#   python -m capstone_common.features materialize [--site muan] [--force] [--rebuild]
+#   python -m capstone_common.features show [--site muan]
+
+FEATURE_VERSION = 3
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "features")
+KEEP_SNAPSHOTS = 2
+FRAMES = ("daily", "hourly")
+
+WEATHER_COLUMNS = ['forecast_irradiance_wm2', 'forecast_temperature_c', 'forecast_wind_speed_ms']
+FIRST_WEATHER_COLUMNS = [f'{column}_first' for column in WEATHER_COLUMNS]
+API_WEATHER_COLUMNS = ['temperature_c', 'wind_speed_ms', 'precip_prob', 'humidity_pct', 'precip_mm']
+DAILY_LAGS = (1, 7)        # 일 발전량 지연 (일)
+HOURLY_LAGS = (24, 168)    # 시간별 발전량 지연 (시간)
+
+DAILY_QUERY = text("""
+    SELECT day, daylight_power_mw, cumulative_min_mwh, cumulative_max_mwh,
+           forecast_irradiance_wm2, forecast_temperature_c, forecast_wind_speed_ms
+    FROM measurement_daily
+    WHERE site_id = :site_id
+    ORDER BY day
+""")
+
+API_WEATHER_QUERY = text("""
+    SELECT forecast_at, temperature_c, wind_speed_ms, precip_prob, humidity_pct, precip_mm
+    FROM hourly_weather_forecast
+    WHERE site_id = :site_id
+    ORDER BY forecast_at
+""")
+
+# measurement를 저장하는 모든 경로가 measurement_daily를 같은 트랜잭션에서 갱신하므로 집계 테이블만 보면 됨
+FINGERPRINT_QUERY = text("""
+    SELECT
+        (SELECT COUNT(*) FROM measurement_daily WHERE site_id = :site_id) AS daily_rows,
+        (SELECT MAX(updated_at) FROM measurement_daily WHERE site_id = :site_id) AS daily_updated_at,
+        (SELECT MAX(issued_at) FROM hourly_weather_forecast WHERE site_id = :site_id) AS weather_issued_at
+""")
+
+def add_calendar_columns(frame):
+    index = frame.index
+    frame['dayofweek'] = index.dayofweek
+    frame['month'] = index.month
+    frame['dayofyear'] = index.dayofyear
+    return frame
+
+# -------------------------------
+# 피처 계산
+# -------------------------------
+# 일별: 날짜 구간 전체로 reindex한 뒤 계산 (shift가 달력 기준 지연이 되도록)
+# 열: daily_mwh, daylight_power_mw, 예보 기상값(일 평균, SARIMA), <예보 기상값>_first(실측 행 중 하루 첫 값, LightGBM),
+#     dayofweek, month, dayofyear, daily_mwh_lag{1,7}, target_next_mwh(다음 날 daily_mwh)
+# measurement_daily에는 SARIMA 예보만 저장된 미래 날짜도 있음 (실측이 없으므로 daily_mwh는 NaN)
+def build_daily_frame(daily, measurements):
+    if daily.empty:
+        return pd.DataFrame(columns=['daily_mwh', 'daylight_power_mw'] + WEATHER_COLUMNS + FIRST_WEATHER_COLUMNS,
+                            dtype=np.float64)
+    index = pd.date_range(daily.index.min(), daily.index.max(), freq='D', name='day')
+    source = daily.reindex(index)
+
+    frame = pd.DataFrame(index=index)
+    frame['daily_mwh'] = source['cumulative_max_mwh'] - source['cumulative_min_mwh']
+    frame['daylight_power_mw'] = source['daylight_power_mw']
+    frame[WEATHER_COLUMNS] = source[WEATHER_COLUMNS]
+    # 기존 LightGBM 학습과 같은 집계: 실측 행(누적 발전량 있음)을 하루 단위로 resample한 첫 값
+    # (measurement 캐시에는 예보 열만 있는 행도 있으므로 실측 행만 사용)
+    measured = measurements[measurements['cumulative_mwh'].notna()]
+    first = measured[WEATHER_COLUMNS].resample('D').first().reindex(index)
+    frame[FIRST_WEATHER_COLUMNS] = first.to_numpy()
+    add_calendar_columns(frame)
+    for lag in DAILY_LAGS:
+        frame[f'daily_mwh_lag{lag}'] = frame['daily_mwh'].shift(lag)
+    frame['target_next_mwh'] = frame['daily_mwh'].shift(-1)
+    return frame
+
+# 시간별: 정시 격자(measurement ∪ 시간별 날씨 예보 구간), 예보 열만 있는 미래 시각도 포함 (power_mw는 NaN)
+# 열: power_mw, energy_mwh(같은 날 안에서 누적 발전량 증분, 0시는 누적 값), 예보 기상값, wx_<API 항목>,
+#     hour, dayofweek, month, dayofyear, power_mw_lag{24,168}
+def build_hourly_frame(measurements, api_weather):
+    hourly = measurements[['power_mw', 'cumulative_mwh'] + WEATHER_COLUMNS].resample('h').mean()
+    api_hourly = api_weather.resample('h').mean() if not api_weather.empty else api_weather
+    if hourly.empty and api_hourly.empty:
+        return pd.DataFrame(columns=['power_mw', 'energy_mwh'] + WEATHER_COLUMNS, dtype=np.float64)
+    bounds = [frame.index for frame in (hourly, api_hourly) if not frame.empty]
+    index = pd.date_range(min(b.min() for b in bounds), max(b.max() for b in bounds), freq='h', name='measured_at')
+    hourly = hourly.reindex(index)
+
+    cumulative = hourly['cumulative_mwh'].to_numpy()
+    days = index.normalize().to_numpy()
+    same_day = np.r_[False, days[1:] == days[:-1]]
+    previous = np.r_[np.nan, cumulative[:-1]]
+
+    frame = pd.DataFrame(index=index)
+    frame['power_mw'] = hourly['power_mw']
+    frame['energy_mwh'] = np.where(same_day, cumulative - previous, cumulative)
+    frame[WEATHER_COLUMNS] = hourly[WEATHER_COLUMNS]
+    for column in API_WEATHER_COLUMNS:
+        frame[f'wx_{column}'] = api_hourly[column].reindex(index) if column in api_hourly else np.nan
+    frame['hour'] = index.hour
+    add_calendar_columns(frame)
+    for lag in HOURLY_LAGS:
+        frame[f'power_mw_lag{lag}'] = frame['power_mw'].shift(lag)
+    return frame
+
+# -------------------------------
+# 스냅샷 저장 / 읽기
+# -------------------------------
+def site_store_dir(site_id, root=STORE_DIR):
+    return os.path.join(root, f"v{FEATURE_VERSION}", site_id)
+
+def _current_path(site_dir):
+    return os.path.join(site_dir, "current.json")
+
+def read_current(site_id, root=STORE_DIR):
+    try:
+        with open(_current_path(site_store_dir(site_id, root)), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_frame(frame, frame_dir):
+    os.makedirs(frame_dir, exist_ok=True)
+    np.save(os.path.join(frame_dir, "index.npy"), frame.index.to_numpy(dtype="datetime64[ns]"))
+    for column in frame.columns:
+        np.save(os.path.join(frame_dir, f"{column}.npy"), frame[column].to_numpy())
+    return list(frame.columns)
+
+def read_frame(frame_dir, columns, index_name):
+    index = pd.DatetimeIndex(np.load(os.path.join(frame_dir, "index.npy")), name=index_name)
+    return pd.DataFrame({column: np.load(os.path.join(frame_dir, f"{column}.npy")) for column in columns}, index=index)
+
+def source_fingerprint(conn, site_id):
+    row = conn.execute(FINGERPRINT_QUERY, {"site_id": site_id}).mappings().fetchone()
+    return hashlib.sha1(json.dumps({key: str(value) for key, value in row.items()}, sort_keys=True)
+                        .encode("utf-8")).hexdigest()
+
+def load_sources(site_id, rebuild=False):
+    with connect() as conn:
+        daily = pd.read_sql(DAILY_QUERY, conn, params={"site_id": site_id}, parse_dates=["day"], index_col="day")
+        api_weather = pd.read_sql(API_WEATHER_QUERY, conn, params={"site_id": site_id},
+                                  parse_dates=["forecast_at"], index_col="forecast_at")
+    measurements = load_measurements_incremental(connect, site_id, rebuild=rebuild)
+    return daily, measurements, api_weather
+
+# 스냅샷 생성: 새 디렉터리에 열 파일을 모두 쓴 뒤 current.json을 교체 (읽는 쪽은 이전 또는 새 스냅샷 전체만 봄)
+# 반환: current.json 내용 (원천 지문이 같고 force가 아니면 기존 스냅샷 그대로)
+def materialize(site_id=None, force=False, rebuild=False, root=STORE_DIR):
+    site_id = get_site(site_id)["id"]
+    site_dir = site_store_dir(site_id, root)
+    with FileLock(os.path.join(site_dir, ".lock")):
+        return _materialize(site_id, site_dir, force, rebuild, root)
+
+def _materialize(site_id, site_dir, force, rebuild, root):
+    current = read_current(site_id, root)
+    with connect() as conn:
+        fingerprint = source_fingerprint(conn, site_id)
+    if current is not None and current["fingerprint"] == fingerprint and not (force or rebuild):
+        print(f"📦 피처 스냅샷 최신 상태 ({site_id}, {current['snapshot']})")
+        return current
+    started = perf_counter()
+    daily, measurements, api_weather = load_sources(site_id, rebuild)
+
+    frames = {"daily": build_daily_frame(daily, measurements), "hourly": build_hourly_frame(measurements, api_weather)}
+    snapshot = f"{datetime.now():%Y%m%dT%H%M%S}_{fingerprint[:8]}"
+    meta = {
+        "feature_version": FEATURE_VERSION,
+        "site_id": site_id,
+        "snapshot": snapshot,
+        "fingerprint": fingerprint,
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "frames": {}
+    }
+    tmp_dir = os.path.join(site_dir, f".{snapshot}.{os.getpid()}.tmp")
+    for name, frame in frames.items():
+        columns = write_frame(frame, os.path.join(tmp_dir, name))
+        meta["frames"][name] = {"rows": int(len(frame)), "columns": columns,
+                                "start": str(frame.index.min()) if len(frame) else None,
+                                "end": str(frame.index.max()) if len(frame) else None}
+    meta["build_seconds"] = round(perf_counter() - started, 3)
+    snapshot_dir = os.path.join(site_dir, snapshot)
+    if os.path.exists(snapshot_dir):
+        shutil.rmtree(snapshot_dir)  # 같은 초에 force로 다시 만든 경우
+    os.replace(tmp_dir, snapshot_dir)
+
+    tmp_path = f"{_current_path(site_dir)}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, _current_path(site_dir))
+    _prune(site_dir, snapshot)
+    print(f"✅ 피처 스냅샷 생성 ({site_id}, {snapshot}): 일별 {meta['frames']['daily']['rows']}행, "
+          f"시간별 {meta['frames']['hourly']['rows']}행, {meta['build_seconds']}s")
+    return meta
+
+# 최근 KEEP_SNAPSHOTS개만 유지 (이름이 생성 시각 순으로 정렬됨, 임시 디렉터리 제외)
+def _prune(site_dir, keep):
+    snapshots = sorted(name for name in os.listdir(site_dir)
+                       if os.path.isdir(os.path.join(site_dir, name)) and not name.startswith("."))
+    for name in snapshots[:-KEEP_SNAPSHOTS]:
+        if name != keep:
+            shutil.rmtree(os.path.join(site_dir, name), ignore_errors=True)
+
+# 같은 프로세스에서 같은 스냅샷을 다시 읽지 않도록 보관
+_loaded = {}
+
+# 피처 프레임 읽기: refresh=True면 원천 지문을 확인하여 바뀌었을 때만 스냅샷을 새로 만듦
+# (정기 파이프라인에서는 features 작업이 수집 직후 미리 만들어 두므로 학습 · 예측 시에는 지문 조회 한 번)
+def load_features(site_id=None, frame="daily", refresh=True, root=STORE_DIR):
+    site_id = get_site(site_id)["id"]
+    meta = materialize(site_id, root=root) if refresh else read_current(site_id, root)
+    if meta is None:
+        meta = materialize(site_id, root=root)
+    key = (root, site_id, frame)
+    cached = _loaded.get(key)
+    if cached is not None and cached[0] == meta["snapshot"]:
+        return cached[1]
+    frame_dir = os.path.join(site_store_dir(site_id, root), meta["snapshot"], frame)
+    features = read_frame(frame_dir, meta["frames"][frame]["columns"], "day" if frame == "daily" else "measured_at")
+    _loaded[key] = (meta["snapshot"], features)
+    return features
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m capstone_common.features", description="공용 피처 저장소")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("materialize", help="피처 스냅샷 생성 (원천이 바뀌었을 때만)")
+    build.add_argument("--site", default=None)
+    build.add_argument("--force", action="store_true", help="원천 지문이 같아도 다시 생성")
+    build.add_argument("--rebuild", action="store_true", help="measurement 캐시도 전체 재생성 (과거 구간 backfill 후)")
+    show = subparsers.add_parser("show", help="현재 스냅샷 정보")
+    show.add_argument("--site", default=None)
+    args = parser.parse_args()
+
+    if args.command == "materialize":
+        materialize(args.site, force=args.force, rebuild=args.rebuild)
+    else:
+        print(json.dumps(read_current(get_site(args.site)["id"]), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
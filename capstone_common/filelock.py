@@ -0,0 +1,49 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# -------------------------------
+# 프로세스 간 파일 잠금
+# -------------------------------
+# 작업 큐 작업자 · 플릿 작업자 · 웹 서버가 서로 다른 프로세스에서 같은 사이트의 캐시 파일(모델 저장소, SARIMA 상태)을
+# 고치므로, 잠금 파일에 flock을 걸어 읽기-수정-쓰기를 한 번에 한 프로세스만 하도록 합니다.
+# - 같은 프로세스 안에서는 RLock으로 재진입을 허용하고, 가장 바깥 진입에서만 파일 잠금을 잡음
+# - 잠금은 프로세스가 죽으면 운영체제가 풀어 줌 (잠금 파일은 지우지 않음)
+# - fcntl이 없는 환경(Windows)에서는 스레드 잠금만 적용
+
+class FileLock:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._depth == 0:
+            try:
+                self._file = open(self.path, "a")
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._lock.release()
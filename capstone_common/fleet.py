@@ -0,0 +1,318 @@
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+import warnings
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timedelta
+from multiprocessing.util import Finalize
+
+if __package__ in (None, ""):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from capstone_common.sites import all_sites, get_site
+
+# -------------------------------
+# 멀티 사이트 플릿 스케줄러
+# -------------------------------
+# 등록된 모든 사이트(capstone_common/sites.json)에 대해 수집 → 피처 생성 → 학습 → 예측 작업을 프로세스 풀에 나눠 실행합니다.
+# - 사이트마다 STAGES의 선행 관계를 따르며, 선행 작업이 실패하면 뒤따르는 작업은 건너뜀(skipped)
+# - 동시 실행 제한: 사이트별 max_concurrency, 단계별 STAGE_LIMITS (크롬 브라우저를 쓰는 crawl · ingest)
+# - 작업자 프로세스는 각 서비스의 app.py를 한 번만 import하여 이후 작업에서 재사용 (스케줄러는 시작하지 않음)
+# - 결과: 작업별 시작/소요 시간, 사이트별 wall time, 전체 wall time과 작업 시간 합계
+# 사용법 (저장소 루트에서):
+#   python -m capstone_common.fleet [--sites muan ...] [--workers 4] [--report fleet.json]
+#   python -m capstone_common.fleet --daily 07:00   # 매일 지정 시각에 실행
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIRS = {
+    "crawler": "capstone_webcrolling",
+    "arima": "capstone_arima",
+    "sarima": "capstone_sarima"
+}
+
+# 단계 → 선행 단계 (선행 단계가 먼저 나오도록 순서 유지, 작업 큐의 DAILY_PIPELINE도 이 정의를 사용)
+STAGES = {
+    "ingest": (),
+    "sarima_weather": (),
+    "features": ("ingest", "sarima_weather"),
+    "train": ("features",),
+    "forecast_daily": ("train",),
+    "forecast_hourly": ("train",),
+    "forecast_sarima": ("features",)
+}
+STAGE_LIMITS = {"crawl": 2, "ingest": 2}  # 단계별 전체 동시 실행 수 (없으면 제한 없음)
+
+# 사이트별 동시 실행 수 (sites.json의 max_concurrency, 최소 1) — 플릿 스케줄러 · 작업 큐 공통
+def site_limit(site):
+    return max(1, int(site["max_concurrency"]))
+
+# -------------------------------
+# 작업자 프로세스
+# -------------------------------
+_apps = {}
+
+# 서비스 디렉터리의 app.py를 고유 이름으로 import (모듈 이름 app 충돌 방지)
+def load_app(name):
+    if name not in _apps:
+        app_dir = os.path.join(ROOT_DIR, APP_DIRS[name])
+        if app_dir not in sys.path:
+            sys.path.append(app_dir)
+        spec = importlib.util.spec_from_file_location(f"fleet_{name}_app", os.path.join(app_dir, "app.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        if name == "crawler":
+            # 작업자 종료 시 이 프로세스가 띄운 브라우저 정리
+            Finalize(None, module.DRIVER_POOL.close, exitpriority=10)
+        _apps[name] = module
+    return _apps[name]
+
+# 작업 큐 작업자 시작 시: 크롤러를 미리 로드하고 브라우저 하나를 띄워 첫 크롤링의 기동 비용을 없앰
+# (Chrome이 없는 환경에서도 작업자는 계속 실행, 크롤링 작업에서 다시 시도)
+def prepare_worker():
+    try:
+        load_app("crawler").DRIVER_POOL.warm_up(1)
+    except Exception as e:
+        print(f"⚠️ 브라우저 워밍업 실패: {e}")
+
+# 작업자 주기 작업: 유휴 시간이 지난 브라우저 정리
+def maintain_worker():
+    if "crawler" in _apps:
+        _apps["crawler"].DRIVER_POOL.evict_idle()
+
+# 이 프로세스의 지표 (지표 이름 → JSON으로 저장 가능한 값): DB 풀, 크롤러를 로드했으면 크롤링 · 날씨 캐시
+def process_metrics():
+    metrics = {}
+    if _apps:
+        from capstone_common.db import pool_metrics
+        metrics["db"] = pool_metrics()
+    if "crawler" in _apps:
+        metrics.update(_apps["crawler"].process_metrics())
+    return metrics
+
+# 각 단계의 반환값은 작업 큐의 작업 결과(JSON)로 저장됨
+def stage_weather(site_id):
+    inserted, updated, hourly_saved = load_app("crawler").insert_weather_data(site_id)
+    return {"inserted": inserted, "updated": updated, "hourly_saved": hourly_saved}
+
+def stage_crawl(site_id):
+    inserted, updated, skipped = load_app("crawler").crawl_site(site_id)
+    return {"inserted": inserted, "updated": updated, "skipped": skipped}
+
+# 날씨 조회 + 발전량 크롤링을 동시에 실행하고 한 번에 저장 (단계별 timeline 반환)
+def stage_ingest(site_id):
+    return load_app("crawler").ingest_site(site_id)
+
+# 수집 직후 피처 스냅샷 생성 (원천이 바뀌지 않았으면 기존 스냅샷 유지)
+def stage_features(site_id):
+    from capstone_common.features import materialize
+    meta = materialize(site_id)
+    return {"snapshot": meta["snapshot"], "rows": {name: frame["rows"] for name, frame in meta["frames"].items()}}
+
+def stage_train(site_id):
+    load_app("arima").train_models(site_id)
+
+def stage_forecast_daily(site_id):
+    forecast_date, result = load_app("arima").run_lgbm_forecast(site_id)
+    if forecast_date is None:
+        raise RuntimeError(result)
+    return {"forecast_date": forecast_date.strftime("%Y-%m-%d"), "predicted_mwh": float(result)}
+
+def stage_forecast_hourly(site_id, days=None):
+    arima = load_app("arima")
+    predicted, message = arima.run_hourly_forecast(days or arima.HOURLY_HORIZON_DAYS, site_id)
+    if predicted is None:
+        raise RuntimeError(message)
+    return {"points": [{"target_at": t.strftime("%Y-%m-%d %H:%M"), "predicted_mw": round(float(v), 3)}
+                       for t, v in predicted.items()]}
+
+def stage_forecast_sarima(site_id):
+    sarima = load_app("sarima")
+    result = sarima.run_sarima_forecast(site_id)
+    if isinstance(result, str):
+        raise RuntimeError(result)
+    today = datetime.now(sarima.KST).date()
+    return {"forecast": [{"date": (today + timedelta(days=i)).isoformat(), "predicted_mwh": float(value)}
+                         for i, value in enumerate(result)],
+            "state_update": sarima.sarima_state(site_id).last_update}
+
+# 플릿 단계 외 작업 (작업 큐의 정기 일정 · 웹 요청에서 사용)
+def stage_refit(site_id):
+    load_app("arima").refit_lgbm_model(site_id)
+
+def stage_sarima_weather(site_id):
+    sarima = load_app("sarima")
+    sarima.insert_forecast_to_db(sarima.crawl_weather_forecast(site_id), site_id)
+
+def stage_solar_preview(site_id):
+    return load_app("crawler").solar_preview(site_id)
+
+def stage_weather_preview(site_id):
+    return {"rows": load_app("crawler").fetch_weather_preview(site_id)}
+
+STAGE_FUNCTIONS = {
+    "ingest": stage_ingest,
+    "weather": stage_weather,
+    "crawl": stage_crawl,
+    "features": stage_features,
+    "train": stage_train,
+    "forecast_daily": stage_forecast_daily,
+    "forecast_hourly": stage_forecast_hourly,
+    "forecast_sarima": stage_forecast_sarima,
+    "refit": stage_refit,
+    "sarima_weather": stage_sarima_weather,
+    "solar_preview": stage_solar_preview,
+    "weather_preview": stage_weather_preview
+}
+
+def _init_worker():
+    warnings.simplefilter("ignore")
+
+# 반환: 작업 기록 (시작/종료는 프로세스 간 비교를 위해 time.time 기준)
+def _run_job(site_id, stage):
+    started = time.time()
+    error = None
+    try:
+        STAGE_FUNCTIONS[stage](site_id)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {"site": site_id, "stage": stage, "status": "failed" if error else "done",
+            "started": started, "finished": time.time(), "pid": os.getpid(), "error": error}
+
+# -------------------------------
+# 스케줄링
+# -------------------------------
+def _ready(job, stages, results):
+    site_id, stage = job
+    deps = [dep for dep in STAGES[stage] if dep in stages]
+    if any(results.get((site_id, dep), {}).get("status") in ("failed", "skipped") for dep in deps):
+        return "skipped"
+    return all((site_id, dep) in results for dep in deps)
+
+def run_fleet(site_ids=None, stages=None, workers=None, stage_limits=STAGE_LIMITS):
+    sites = [get_site(site_id) for site_id in site_ids] if site_ids else all_sites()
+    stages = [stage for stage in STAGES if stage in (stages or STAGES)]
+    site_limits = {site["id"]: site_limit(site) for site in sites}
+
+    # 단계 순서 → 사이트 순서로 대기열 구성 (같은 단계를 여러 사이트에 먼저 퍼뜨림)
+    pending = [(site["id"], stage) for stage in stages for site in sites]
+    results, running = {}, {}
+    site_running, stage_running = Counter(), Counter()
+    print(f"🚚 플릿 실행: 사이트 {len(sites)}개 × 단계 {len(stages)}개 = 작업 {len(pending)}개")
+
+    fleet_started = time.time()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        while pending or running:
+            for job in list(pending):
+                site_id, stage = job
+                state = _ready(job, stages, results)
+                if state == "skipped":
+                    pending.remove(job)
+                    now = time.time()
+                    results[job] = {"site": site_id, "stage": stage, "status": "skipped",
+                                    "started": now, "finished": now, "pid": None, "error": "선행 작업 실패"}
+                    print(f"⏭ {site_id}/{stage}: 선행 작업 실패로 건너뜀")
+                    continue
+                if not state:
+                    continue
+                if site_running[site_id] >= site_limits[site_id]:
+                    continue
+                limit = stage_limits.get(stage)
+                if limit is not None and stage_running[stage] >= limit:
+                    continue
+                pending.remove(job)
+                site_running[site_id] += 1
+                stage_running[stage] += 1
+                running[executor.submit(_run_job, site_id, stage)] = job
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                site_id, stage = job
+                site_running[site_id] -= 1
+                stage_running[stage] -= 1
+                result = future.result()
+                results[job] = result
+                seconds = result["finished"] - result["started"]
+                if result["status"] == "done":
+                    print(f"✅ {site_id}/{stage}: {seconds:.1f}s (pid {result['pid']})")
+                else:
+                    print(f"❌ {site_id}/{stage}: {seconds:.1f}s - {result['error']}")
+
+    return build_report(list(results.values()), fleet_started, time.time())
+
+# 반환: {"jobs", "sites", "wall_seconds", "job_seconds", "parallelism", "failed", "skipped"}
+def build_report(jobs, fleet_started, fleet_finished):
+    for job in jobs:
+        job["offset"] = round(job["started"] - fleet_started, 3)
+        job["seconds"] = round(job["finished"] - job["started"], 3)
+    jobs.sort(key=lambda job: (job["offset"], job["site"]))
+
+    sites = {}
+    for site_id in dict.fromkeys(job["site"] for job in jobs):
+        site_jobs = [job for job in jobs if job["site"] == site_id and job["status"] != "skipped"]
+        sites[site_id] = {
+            "wall_seconds": round(max(j["finished"] for j in site_jobs) - min(j["started"] for j in site_jobs), 3)
+            if site_jobs else 0.0,
+            "job_seconds": round(sum(j["seconds"] for j in site_jobs), 3),
+            "status": Counter(job["status"] for job in jobs if job["site"] == site_id)
+        }
+
+    wall_seconds = fleet_finished - fleet_started
+    job_seconds = sum(job["seconds"] for job in jobs)
+    return {
+        "jobs": jobs,
+        "sites": sites,
+        "wall_seconds": round(wall_seconds, 3),
+        "job_seconds": round(job_seconds, 3),
+        "parallelism": round(job_seconds / wall_seconds, 2) if wall_seconds > 0 else None,
+        "failed": sum(job["status"] == "failed" for job in jobs),
+        "skipped": sum(job["status"] == "skipped" for job in jobs)
+    }
+
+def print_report(report):
+    print("📊 사이트별 wall time:")
+    for site_id, site in report["sites"].items():
+        status = ", ".join(f"{name} {count}" for name, count in site["status"].items())
+        print(f"  {site_id}: {site['wall_seconds']:.1f}s (작업 시간 합계 {site['job_seconds']:.1f}s, {status})")
+    print(f"⏱ 전체 wall time {report['wall_seconds']:.1f}s, 작업 시간 합계 {report['job_seconds']:.1f}s "
+          f"(평균 동시 실행 {report['parallelism']}), 실패 {report['failed']}개, 건너뜀 {report['skipped']}개")
+
+def run_and_report(site_ids=None, stages=None, workers=None, report_path=None):
+    report = run_fleet(site_ids, stages, workers)
+    print_report(report)
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m capstone_common.fleet", description="멀티 사이트 수집·학습·예측 실행")
+    parser.add_argument("--sites", nargs="+", default=None, help="사이트 키 (기본: 등록된 전체)")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=None, help="실행할 단계 (기본: 전체)")
+    parser.add_argument("--workers", type=int, default=None, help="작업자 프로세스 수")
+    parser.add_argument("--report", default=None, help="실행 결과 JSON 저장 경로")
+    parser.add_argument("--daily", default=None, metavar="HH:MM", help="매일 지정 시각(KST)에 반복 실행")
+    args = parser.parse_args()
+
+    if not args.daily:
+        run_and_report(args.sites, args.stages, args.workers, args.report)
+        return
+
+    from apscheduler.schedulers.blocking import BlockingScheduler
+
+    hour, minute = (int(part) for part in args.daily.split(":"))
+    scheduler = BlockingScheduler(timezone="Asia/Seoul")
+    scheduler.add_job(run_and_report, 'cron', hour=hour, minute=minute,
+                      args=(args.sites, args.stages, args.workers, args.report))
+    print(f"🕖 매일 {args.daily} 플릿 실행 대기 중...")
+    scheduler.start()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,492 @@
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import closing, contextmanager
+from datetime import datetime
+
+import pytz
+
+if __package__ in (None, ""):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from capstone_common.fleet import (STAGE_FUNCTIONS, STAGE_LIMITS, STAGES, maintain_worker, prepare_worker, process_metrics,
+                                   site_limit)
+from capstone_common.sites import all_sites, get_site
+
+# -------------------------------
+# 영속 작업 큐 (SQLite)
+# -------------------------------
+# 각 Flask 앱의 BackgroundScheduler 대신, 작업을 SQLite 파일에 기록하고 별도 작업자 프로세스가 실행합니다.
+# 웹 서버 프로세스 수와 관계없이 작업은 한 번만 실행되며, 모델 학습은 웹 프로세스 밖에서 수행됩니다.
+# - 중복 제거: 같은 dedup_key의 작업이 대기/실행 중이면 새로 만들지 않고 기존 작업 id 반환
+#   (키는 job_key(종류, 인자)로 통일하여 웹 요청 · 파이프라인 · 수동 등록이 같은 사이트의 같은 작업을 하나로 병합,
+#   대기 중인 작업에 병합되면 새 선행 작업을 추가로 기다림)
+# - 잠금: BEGIN IMMEDIATE 트랜잭션으로 작업을 하나씩 가져가고, 실행 중에는 lease를 주기적으로 연장
+#   (작업자가 죽어 lease가 만료되면 다른 작업자가 다시 가져감)
+# - 선행 작업: 모든 선행 작업이 done이어야 실행, 선행 작업이 실패하면 skipped
+# - 재시도: 실패 시 RETRY_BACKOFF_SECONDS × 2^(시도-1) 뒤 다시 실행, max_attempts 초과 시 failed
+# - 실행 이력: 시도마다 job_runs에 작업자·소요 시간·오류를 기록
+# - 정기 일정: SCHEDULES의 시각이 지나면 당일 파이프라인을 한 번만 등록 (schedule_runs로 중복 방지)
+# - 작업자 지표: 크롤링 · 날씨 캐시 · DB 풀 지표는 작업자 프로세스마다 쌓이므로 worker_metrics에 기록하여 웹 프로세스에서 조회
+# 사용법 (저장소 루트에서):
+#   python -m capstone_common.jobqueue worker [--workers 2]      # 작업자 + 정기 일정
+#   python -m capstone_common.jobqueue enqueue crawl --site muan
+#   python -m capstone_common.jobqueue pipeline [--sites muan]    # 당일 파이프라인 즉시 등록
+#   python -m capstone_common.jobqueue status
+
+QUEUE_PATH = os.environ.get("JOBQUEUE_PATH",
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "jobqueue.sqlite3"))
+KST = pytz.timezone("Asia/Seoul")
+LEASE_SECONDS = 300
+HEARTBEAT_SECONDS = 60
+POLL_SECONDS = 2.0
+DEFAULT_MAX_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 60
+MAINTENANCE_SECONDS = 60        # 작업자 주기 작업(유휴 브라우저 정리 · 지표 기록) 간격
+METRICS_MAX_AGE = 3600          # 이 시간(초) 안에 기록된 작업자 지표만 조회 (종료된 작업자 제외)
+
+# 파이프라인: 단계 → 선행 단계 (플릿 스케줄러의 STAGES와 같은 정의)
+DAILY_PIPELINE = STAGES
+WEEKLY_REFIT = {"refit": ()}
+
+# (일정 이름, 요일 (0=월 ~ 6=일, None=매일), 시각, 파이프라인)
+SCHEDULES = [
+    ("daily_pipeline", None, "07:00", DAILY_PIPELINE),
+    ("weekly_refit", 6, "03:00", WEEKLY_REFIT)
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    args TEXT NOT NULL,
+    dedup_key TEXT,
+    state TEXT NOT NULL DEFAULT 'queued',   -- queued / running / done / failed / skipped
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_after REAL NOT NULL,
+    lease_until REAL,
+    worker TEXT,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_jobs_active_dedup ON jobs (dedup_key) WHERE state IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS ix_jobs_state ON jobs (state, run_after);
+
+CREATE TABLE IF NOT EXISTS job_deps (
+    job_id INTEGER NOT NULL,
+    depends_on INTEGER NOT NULL,
+    PRIMARY KEY (job_id, depends_on)
+);
+
+CREATE TABLE IF NOT EXISTS job_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    worker TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    seconds REAL,
+    status TEXT NOT NULL DEFAULT 'running',  -- running / done / retry / failed / expired
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_job_runs_kind ON job_runs (kind, started_at);
+
+CREATE TABLE IF NOT EXISTS schedule_runs (
+    schedule TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    enqueued_at REAL NOT NULL,
+    PRIMARY KEY (schedule, run_date)
+);
+
+CREATE TABLE IF NOT EXISTS worker_metrics (
+    worker TEXT NOT NULL,
+    name TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (worker, name)
+);
+"""
+
+# 실행 대기 중이고, 시각이 되었고, 모든 선행 작업이 done인 작업
+RUNNABLE_SQL = """
+    SELECT * FROM jobs j
+    WHERE j.state = 'queued' AND j.run_after <= :now
+      AND NOT EXISTS (
+          SELECT 1 FROM job_deps d JOIN jobs p ON p.id = d.depends_on
+          WHERE d.job_id = j.id AND p.state != 'done')
+    ORDER BY j.priority DESC, j.id
+"""
+
+SKIP_ORPHANS_SQL = """
+    UPDATE jobs SET state = 'skipped', error = '선행 작업 실패', finished_at = :now
+    WHERE state = 'queued' AND EXISTS (
+        SELECT 1 FROM job_deps d JOIN jobs p ON p.id = d.depends_on
+        WHERE d.job_id = jobs.id AND p.state IN ('failed', 'skipped'))
+"""
+
+
+# 같은 작업(종류 + 인자)이면 어디서 등록해도 같은 중복 제거 키
+def job_key(kind, args):
+    return f"{kind}:{json.dumps(args or {}, sort_keys=True, ensure_ascii=False)}"
+
+def _decode(row):
+    if row is None:
+        return None
+    job = dict(row)
+    job["args"] = json.loads(job["args"])
+    job["result"] = json.loads(job["result"]) if job.get("result") is not None else None
+    return job
+
+
+class JobQueue:
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    # 작업마다 새 연결 사용 (스레드·프로세스 간 공유하지 않음)
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    # 쓰기 잠금을 먼저 잡는 트랜잭션 (여러 작업자가 같은 작업을 가져가지 않도록)
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    # 반환: (작업 id, 새로 만들었는지 여부)
+    def enqueue(self, kind, args=None, dedup_key=None, depends_on=(), priority=0,
+                max_attempts=DEFAULT_MAX_ATTEMPTS, delay=0.0):
+        if kind not in STAGE_FUNCTIONS:
+            raise ValueError(f"알 수 없는 작업 종류: {kind}")
+        now = time.time()
+        with self._transaction() as conn:
+            if dedup_key is not None:
+                row = conn.execute("SELECT id, state FROM jobs WHERE dedup_key = ? AND state IN ('queued', 'running')",
+                                   (dedup_key,)).fetchone()
+                if row is not None:
+                    if row["state"] == "queued":
+                        conn.executemany("INSERT OR IGNORE INTO job_deps (job_id, depends_on) VALUES (?, ?)",
+                                         [(row["id"], dep) for dep in depends_on if dep != row["id"]])
+                    return row["id"], False
+            job_id = conn.execute("""
+                INSERT INTO jobs (kind, args, dedup_key, priority, max_attempts, run_after, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (kind, json.dumps(args or {}, ensure_ascii=False), dedup_key, priority, max_attempts,
+                  now + delay, now)).lastrowid
+            conn.executemany("INSERT OR IGNORE INTO job_deps (job_id, depends_on) VALUES (?, ?)",
+                             [(job_id, dep) for dep in depends_on])
+            return job_id, True
+
+    # 실행할 작업 하나를 잠그고 반환 (없으면 None)
+    # limits: 작업 종류별 동시 실행 수, 사이트별 동시 실행 수는 sites.json의 max_concurrency (플릿 스케줄러와 동일)
+    def claim(self, worker, limits=None, lease_seconds=LEASE_SECONDS):
+        now = time.time()
+        site_limits = {site["id"]: site_limit(site) for site in all_sites()}
+        with self._transaction() as conn:
+            self._expire_leases(conn, now)
+            while conn.execute(SKIP_ORPHANS_SQL, {"now": now}).rowcount:
+                pass
+
+            running_kinds, running_sites = Counter(), Counter()
+            for row in conn.execute("SELECT kind, args FROM jobs WHERE state = 'running'"):
+                running_kinds[row["kind"]] += 1
+                running_sites[json.loads(row["args"]).get("site_id")] += 1
+            for row in conn.execute(RUNNABLE_SQL, {"now": now}).fetchall():
+                limit = (limits or {}).get(row["kind"])
+                if limit is not None and running_kinds[row["kind"]] >= limit:
+                    continue
+                site_id = json.loads(row["args"]).get("site_id")
+                if site_id in site_limits and running_sites[site_id] >= site_limits[site_id]:
+                    continue
+                conn.execute("""
+                    UPDATE jobs SET state = 'running', attempts = attempts + 1, worker = ?, lease_until = ?
+                    WHERE id = ?
+                """, (worker, now + lease_seconds, row["id"]))
+                run_id = conn.execute("""
+                    INSERT INTO job_runs (job_id, kind, attempt, worker, started_at) VALUES (?, ?, ?, ?, ?)
+                """, (row["id"], row["kind"], row["attempts"] + 1, worker, now)).lastrowid
+                job = _decode(row)
+                job.update(state="running", attempts=row["attempts"] + 1, worker=worker, run_id=run_id)
+                return job
+        return None
+
+    # lease가 만료된 실행 중 작업은 시도 횟수가 남았으면 다시 대기열로
+    def _expire_leases(self, conn, now):
+        expired = conn.execute("SELECT id, attempts, max_attempts FROM jobs WHERE state = 'running' AND lease_until < ?",
+                               (now,)).fetchall()
+        for row in expired:
+            final = row["attempts"] >= row["max_attempts"]
+            conn.execute("""
+                UPDATE jobs SET state = ?, worker = NULL, lease_until = NULL, error = 'lease 만료 (작업자 중단)',
+                                finished_at = ?
+                WHERE id = ?
+            """, ("failed" if final else "queued", now if final else None, row["id"]))
+            conn.execute("""
+                UPDATE job_runs SET status = 'expired', finished_at = ?, seconds = ? - started_at
+                WHERE job_id = ? AND status = 'running'
+            """, (now, now, row["id"]))
+
+    def heartbeat(self, job_id, worker, lease_seconds=LEASE_SECONDS):
+        with self._transaction() as conn:
+            conn.execute("UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND state = 'running'",
+                         (time.time() + lease_seconds, job_id, worker))
+
+    def complete(self, job, result=None, seconds=None):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("""
+                UPDATE jobs SET state = 'done', result = ?, error = NULL, lease_until = NULL, finished_at = ?
+                WHERE id = ? AND worker = ?
+            """, (json.dumps(result, ensure_ascii=False, default=str), now, job["id"], job["worker"]))
+            conn.execute("UPDATE job_runs SET status = 'done', finished_at = ?, seconds = ? WHERE id = ?",
+                         (now, seconds, job["run_id"]))
+
+    def fail(self, job, error, seconds=None):
+        now = time.time()
+        retry = job["attempts"] < job["max_attempts"]
+        with self._transaction() as conn:
+            if retry:
+                conn.execute("""
+                    UPDATE jobs SET state = 'queued', error = ?, worker = NULL, lease_until = NULL, run_after = ?
+                    WHERE id = ? AND worker = ?
+                """, (error, now + RETRY_BACKOFF_SECONDS * 2 ** (job["attempts"] - 1), job["id"], job["worker"]))
+            else:
+                conn.execute("""
+                    UPDATE jobs SET state = 'failed', error = ?, lease_until = NULL, finished_at = ?
+                    WHERE id = ? AND worker = ?
+                """, (error, now, job["id"], job["worker"]))
+            conn.execute("UPDATE job_runs SET status = ?, finished_at = ?, seconds = ?, error = ? WHERE id = ?",
+                         ("retry" if retry else "failed", now, seconds, error, job["run_id"]))
+        return retry
+
+    def get(self, job_id):
+        with closing(self._connect()) as conn:
+            return _decode(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    # 대기 순번 · 아직 끝나지 않은 선행 작업 · 현재 시도 시작 시각
+    def progress(self, job_id):
+        with closing(self._connect()) as conn:
+            return {
+                "queued_ahead": conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE state = 'queued' AND id < ?", (job_id,)).fetchone()[0],
+                "waiting_on": [dict(row) for row in conn.execute("""
+                    SELECT p.id AS job_id, p.kind, p.state FROM job_deps d JOIN jobs p ON p.id = d.depends_on
+                    WHERE d.job_id = ? AND p.state != 'done'
+                """, (job_id,))],
+                "started_at": conn.execute(
+                    "SELECT MAX(started_at) FROM job_runs WHERE job_id = ?", (job_id,)).fetchone()[0]
+            }
+
+    def recent_done(self, kind, limit=20):
+        with closing(self._connect()) as conn:
+            return [_decode(row) for row in conn.execute(
+                "SELECT * FROM jobs WHERE kind = ? AND state = 'done' ORDER BY finished_at DESC LIMIT ?", (kind, limit))]
+
+    def recent_jobs(self, limit=20):
+        with closing(self._connect()) as conn:
+            return [_decode(row) for row in conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))]
+
+    def history(self, kind=None, limit=50):
+        query = "SELECT * FROM job_runs" + (" WHERE kind = ?" if kind else "") + " ORDER BY id DESC LIMIT ?"
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(query, (kind, limit) if kind else (limit,))]
+
+    # 작업 종류별 실행 횟수, 실패 수, 평균/최대/최근 소요 시간
+    def runtime_stats(self):
+        with closing(self._connect()) as conn:
+            rows = conn.execute("""
+                SELECT kind, COUNT(*) AS runs,
+                       SUM(status IN ('failed', 'retry', 'expired')) AS failures,
+                       AVG(CASE WHEN status = 'done' THEN seconds END) AS avg_seconds,
+                       MAX(CASE WHEN status = 'done' THEN seconds END) AS max_seconds,
+                       MAX(started_at) AS last_started
+                FROM job_runs GROUP BY kind ORDER BY kind
+            """).fetchall()
+            counts = dict(conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        return {"jobs": counts, "kinds": [dict(row) for row in rows]}
+
+    # 일정 실행 기록: 처음 기록한 호출만 True (여러 작업자가 같은 일정을 중복 등록하지 않도록)
+    def mark_schedule(self, schedule, run_date):
+        with self._transaction() as conn:
+            return conn.execute("INSERT OR IGNORE INTO schedule_runs (schedule, run_date, enqueued_at) VALUES (?, ?, ?)",
+                                (schedule, run_date, time.time())).rowcount == 1
+
+    # 작업자 프로세스의 최신 지표로 덮어씀 (name: crawl / weather / db)
+    def publish_metrics(self, worker, name, payload):
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO worker_metrics (worker, name, payload, updated_at) VALUES (?, ?, ?, ?)",
+                         (worker, name, json.dumps(payload, ensure_ascii=False, default=str), time.time()))
+
+    # 반환: [{"worker", "updated_at", "metrics"}] (max_age초 안에 기록된 작업자만)
+    def worker_metrics(self, name, max_age=METRICS_MAX_AGE):
+        with closing(self._connect()) as conn:
+            rows = conn.execute("""
+                SELECT worker, payload, updated_at FROM worker_metrics
+                WHERE name = ? AND updated_at >= ? ORDER BY worker
+            """, (name, time.time() - max_age)).fetchall()
+        return [{"worker": row["worker"], "updated_at": row["updated_at"], "metrics": json.loads(row["payload"])}
+                for row in rows]
+
+
+# 사이트마다 파이프라인 작업을 선행 관계와 함께 등록 (같은 사이트의 같은 작업이 대기/실행 중이면 재사용, run_key는 로그 표시용)
+def enqueue_pipeline(queue, pipeline, run_key, site_ids=None):
+    sites = [get_site(site_id) for site_id in site_ids] if site_ids else all_sites()
+    job_ids = {}
+    for site in sites:
+        for stage, deps in pipeline.items():
+            job_ids[(site["id"], stage)], _ = queue.enqueue(
+                stage, {"site_id": site["id"]}, dedup_key=job_key(stage, {"site_id": site["id"]}),
+                depends_on=[job_ids[(site["id"], dep)] for dep in deps if (site["id"], dep) in job_ids])
+    print(f"🗂 작업 등록 ({run_key}): 사이트 {len(sites)}개 × 단계 {len(pipeline)}개")
+    return job_ids
+
+# 지난 일정 중 오늘 아직 등록하지 않은 것을 등록 (작업자가 꺼져 있던 동안의 일정은 시작 시 한 번 실행)
+def schedule_tick(queue, now=None):
+    now = now or datetime.now(KST)
+    for name, weekday, at, pipeline in SCHEDULES:
+        if weekday is not None and now.weekday() != weekday:
+            continue
+        if now.strftime("%H:%M") < at:
+            continue
+        run_date = now.date().isoformat()
+        if queue.mark_schedule(name, run_date):
+            enqueue_pipeline(queue, pipeline, f"{name}:{run_date}")
+
+# -------------------------------
+# 작업자 프로세스
+# -------------------------------
+def _heartbeat(path, job_id, worker, stop):
+    queue = JobQueue(path)
+    while not stop.wait(HEARTBEAT_SECONDS):
+        queue.heartbeat(job_id, worker)
+
+def run_claimed(queue, job):
+    stop = threading.Event()
+    threading.Thread(target=_heartbeat, args=(queue.path, job["id"], job["worker"], stop), daemon=True).start()
+    label = f"#{job['id']} {job['kind']} {job['args']} (시도 {job['attempts']}/{job['max_attempts']})"
+    started = time.perf_counter()
+    try:
+        result = STAGE_FUNCTIONS[job["kind"]](**job["args"])
+    except Exception as e:
+        seconds = time.perf_counter() - started
+        retry = queue.fail(job, f"{type(e).__name__}: {e}", seconds)
+        print(f"{'🔁' if retry else '❌'} {label}: {seconds:.1f}s - {e}")
+    else:
+        seconds = time.perf_counter() - started
+        queue.complete(job, result, seconds)
+        print(f"✅ {label}: {seconds:.1f}s")
+    finally:
+        stop.set()
+
+# 이 프로세스에 로드된 서비스의 지표를 작업 큐에 기록 (기록 실패는 작업 실행에 영향 없음)
+def publish_process_metrics(queue, name):
+    try:
+        for metric_name, payload in process_metrics().items():
+            queue.publish_metrics(name, metric_name, payload)
+    except Exception as e:
+        print(f"⚠️ 작업자 지표 기록 실패 ({name}): {e}")
+
+def worker_loop(path, name, limits, stop):
+    import warnings
+    warnings.simplefilter("ignore")
+    queue = JobQueue(path)
+    prepare_worker()
+    last_maintenance = time.monotonic()
+    while not stop.is_set():
+        if time.monotonic() - last_maintenance >= MAINTENANCE_SECONDS:
+            maintain_worker()
+            publish_process_metrics(queue, name)
+            last_maintenance = time.monotonic()
+        job = queue.claim(name, limits)
+        if job is None:
+            stop.wait(POLL_SECONDS)
+            continue
+        run_claimed(queue, job)
+        publish_process_metrics(queue, name)
+
+def run_workers(path=QUEUE_PATH, workers=2, limits=STAGE_LIMITS, schedule=True):
+    queue = JobQueue(path)
+    stop = multiprocessing.Event()
+    host = f"{socket.gethostname()}:{os.getpid()}"
+    processes = [multiprocessing.Process(target=worker_loop, args=(path, f"{host}/{i}", limits, stop), daemon=True)
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    print(f"👷 작업자 {workers}개 실행 중 (큐: {path}, 정기 일정 {'사용' if schedule else '사용 안 함'})")
+    try:
+        while True:
+            if schedule:
+                schedule_tick(queue)
+            time.sleep(30)
+    except KeyboardInterrupt:
+        print("🛑 작업자 종료 중... (실행 중인 작업이 끝나면 종료)")
+        stop.set()
+        for process in processes:
+            process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m capstone_common.jobqueue", description="영속 작업 큐")
+    parser.add_argument("--queue", default=QUEUE_PATH, help="SQLite 파일 경로")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    worker = subparsers.add_parser("worker", help="작업자 실행 (정기 일정 포함)")
+    worker.add_argument("--workers", type=int, default=2)
+    worker.add_argument("--no-schedule", action="store_true", help="정기 일정을 등록하지 않음")
+
+    enqueue = subparsers.add_parser("enqueue", help="작업 하나 등록")
+    enqueue.add_argument("kind", choices=list(STAGE_FUNCTIONS))
+    enqueue.add_argument("--site", default=None)
+
+    pipeline = subparsers.add_parser("pipeline", help="당일 파이프라인 즉시 등록")
+    pipeline.add_argument("--sites", nargs="+", default=None)
+
+    subparsers.add_parser("status", help="최근 작업과 작업 종류별 실행 시간")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        run_workers(args.queue, args.workers, schedule=not args.no_schedule)
+        return
+
+    queue = JobQueue(args.queue)
+    if args.command == "enqueue":
+        site_id = get_site(args.site)["id"]
+        job_args = {"site_id": site_id}
+        job_id, created = queue.enqueue(args.kind, job_args, dedup_key=job_key(args.kind, job_args))
+        print(f"{'🗂 등록' if created else 'ℹ️ 이미 대기/실행 중'}: #{job_id}")
+    elif args.command == "pipeline":
+        enqueue_pipeline(queue, DAILY_PIPELINE, f"manual:{datetime.now(KST).date().isoformat()}", args.sites)
+    else:
+        for job in reversed(queue.recent_jobs()):
+            print(f"#{job['id']:<5} {job['state']:<8} {job['kind']:<16} {job['args']} 시도 {job['attempts']}"
+                  + (f" - {job['error']}" if job["error"] else ""))
+        print(json.dumps(queue.runtime_stats(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
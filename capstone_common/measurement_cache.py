@@ -0,0 +1,164 @@
+import json
+import os
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from capstone_common.filelock import FileLock
+
+# -------------------------------
+# measurement 로컬 열 단위 캐시 (증분 로딩)
+# -------------------------------
+# 열마다 .npy 파일 하나로 저장하고 메모리 맵으로 읽습니다.
+# measurement를 저장하는 모든 경로(크롤러 · backfill · SARIMA 예보 저장 · rollups rebuild)는 같은 트랜잭션에서
+# measurement_daily의 해당 날짜 행을 갱신하므로(updated_at = NOW()), meta.json의 rollup_watermark
+# (지난 조회 시점의 MAX(updated_at)) 이후 갱신된 날짜만 DB에서 다시 읽어 그 날짜의 캐시 행을 교체합니다.
+# 오래된 날짜를 backfill · 수정해도 다음 로딩에서 반영됩니다. 커밋이 늦은 트랜잭션을 놓치지 않도록
+# watermark보다 REFETCH_SLACK만큼 앞에서부터 조회합니다.
+# rebuild=True이면 전체를 다시 만듭니다.
+# 실측 행뿐 아니라 예보 열만 저장된 행(크롤러의 내일 예보, SARIMA 7일 예보)도 포함합니다 (시간별 예측의 예보 피처).
+# 저장된 열 구성이 VALUE_COLUMNS와 다르거나 CACHE_VERSION이 다르면 캐시를 다시 만듭니다.
+# 사이트마다 cache/measurement/<site_id>/ 아래에 별도 캐시를 둡니다 (피처 저장소 features.py의 시간별 원천 데이터).
+# 여러 프로세스가 같은 사이트 캐시를 읽고 고치므로 사이트 캐시의 잠금 파일(.lock)을 잡고 읽기-병합-쓰기를 하고,
+# 임시 파일 이름에 프로세스 id를 붙여 서로의 임시 파일을 덮어쓰지 않게 합니다.
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "measurement")
+VALUE_COLUMNS = ["power_mw", "cumulative_mwh", "forecast_irradiance_wm2", "forecast_temperature_c", "forecast_wind_speed_ms"]
+REFETCH_SLACK = timedelta(hours=1)
+CACHE_VERSION = 2    # 캐시에 담는 행 기준이 바뀌면 올림 (2: 예보 열만 있는 행 포함)
+
+FULL_QUERY = """
+    SELECT measured_at, power_mw, cumulative_mwh,
+           forecast_irradiance_wm2, forecast_temperature_c, forecast_wind_speed_ms
+    FROM measurement
+    WHERE site_id = :site_id
+    ORDER BY measured_at
+"""
+
+# 갱신된 날짜의 measurement 행 ((site_id, measured_at) 키 범위 조회)
+CHANGED_QUERY = """
+    SELECT m.measured_at, m.power_mw, m.cumulative_mwh,
+           m.forecast_irradiance_wm2, m.forecast_temperature_c, m.forecast_wind_speed_ms
+    FROM measurement_daily d
+    JOIN measurement m
+      ON m.site_id = d.site_id AND m.measured_at >= d.day AND m.measured_at < d.day + INTERVAL 1 DAY
+    WHERE d.site_id = :site_id AND d.updated_at >= :since
+    ORDER BY m.measured_at
+"""
+
+CHANGED_DAYS_QUERY = """
+    SELECT day FROM measurement_daily WHERE site_id = :site_id AND updated_at >= :since
+"""
+
+ROLLUP_WATERMARK_QUERY = """
+    SELECT MAX(updated_at) AS watermark FROM measurement_daily WHERE site_id = :site_id
+"""
+
+def site_cache_dir(site_id, root=CACHE_DIR):
+    return os.path.join(root, site_id)
+
+def _meta_path(cache_dir):
+    return os.path.join(cache_dir, "meta.json")
+
+def _column_path(cache_dir, column):
+    return os.path.join(cache_dir, f"{column}.npy")
+
+def read_cache(cache_dir):
+    meta_path = _meta_path(cache_dir)
+    if not os.path.exists(meta_path):
+        return None, None
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("columns") != VALUE_COLUMNS or meta.get("version") != CACHE_VERSION:
+        return None, None
+    arrays = {column: np.load(_column_path(cache_dir, column), mmap_mode="r")
+              for column in ["measured_at"] + VALUE_COLUMNS}
+    return arrays, meta
+
+# 열 파일을 임시 이름으로 쓴 뒤 교체하고, meta.json은 마지막에 교체하여 일관성 유지
+def write_cache(arrays, cache_dir, rollup_watermark):
+    os.makedirs(cache_dir, exist_ok=True)
+    for column, values in arrays.items():
+        tmp_path = os.path.join(cache_dir, f"{column}.{os.getpid()}.tmp.npy")
+        np.save(tmp_path, values)
+        os.replace(tmp_path, _column_path(cache_dir, column))
+    measured_at = arrays["measured_at"]
+    meta = {
+        "version": CACHE_VERSION,
+        "rows": int(len(measured_at)),
+        "columns": VALUE_COLUMNS,
+        "watermark": str(pd.Timestamp(measured_at[-1])) if len(measured_at) else None,
+        "rollup_watermark": rollup_watermark
+    }
+    return _write_meta(cache_dir, meta)
+
+def _write_meta(cache_dir, meta):
+    tmp_meta = f"{_meta_path(cache_dir)}.{os.getpid()}.tmp"
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_meta, _meta_path(cache_dir))
+    return meta
+
+def _read_arrays(conn, query, params):
+    df = pd.read_sql(text(query), conn, params=params, parse_dates=["measured_at"])
+    fetched = {"measured_at": df["measured_at"].to_numpy(dtype="datetime64[ns]")}
+    for column in VALUE_COLUMNS:
+        fetched[column] = df[column].to_numpy(dtype=np.float64)
+    return fetched
+
+# 갱신된 날짜의 캐시 행을 DB 행으로 교체 (날짜에 남은 행이 없으면 그 날짜의 캐시 행은 삭제)
+def _replace_days(cached, fetched, days):
+    cached_days = cached["measured_at"].astype("datetime64[D]")
+    keep = ~np.isin(cached_days, days)
+    merged = {column: np.concatenate([cached[column][keep], fetched[column]]) for column in fetched}
+    order = np.argsort(merged["measured_at"], kind="stable")
+    return {column: values[order] for column, values in merged.items()}
+
+def load_measurements_incremental(connect, site_id, cache_dir=None, slack=REFETCH_SLACK, rebuild=False):
+    cache_dir = cache_dir or site_cache_dir(site_id)
+    with FileLock(os.path.join(cache_dir, ".lock")):
+        return _load_incremental(connect, site_id, cache_dir, slack, rebuild)
+
+def _load_incremental(connect, site_id, cache_dir, slack, rebuild):
+    cached, meta = (None, None) if rebuild else read_cache(cache_dir)
+
+    with connect() as conn:
+        # 조회 전에 watermark를 먼저 읽음 (조회 중 갱신된 날짜는 다음 로딩에서 다시 읽힘)
+        row = conn.execute(text(ROLLUP_WATERMARK_QUERY), {"site_id": site_id}).mappings().fetchone()
+        rollup_watermark = str(row["watermark"]) if row and row["watermark"] is not None else None
+        if cached is None or meta["rollup_watermark"] is None:
+            fetched = _read_arrays(conn, FULL_QUERY, {"site_id": site_id})
+            days = None
+        else:
+            params = {"site_id": site_id,
+                      "since": (pd.Timestamp(meta["rollup_watermark"]) - slack).to_pydatetime()}
+            fetched = _read_arrays(conn, CHANGED_QUERY, params)
+            days = pd.read_sql(text(CHANGED_DAYS_QUERY), conn, params=params, parse_dates=["day"])["day"] \
+                .to_numpy(dtype="datetime64[D]")
+
+    if days is None:
+        merged = fetched
+    else:
+        merged = _replace_days(cached, fetched, days)
+    # 교체한 날짜의 값이 캐시와 같으면 파일을 다시 쓰지 않음 (watermark만 바뀐 경우 meta만 갱신)
+    unchanged = cached is not None and len(merged["measured_at"]) == meta["rows"] and all(
+        np.array_equal(cached[column], merged[column], equal_nan=column != "measured_at")
+        for column in merged
+    )
+    if unchanged:
+        merged = cached
+        if rollup_watermark != meta["rollup_watermark"]:
+            meta = _write_meta(cache_dir, dict(meta, rollup_watermark=rollup_watermark))
+        print(f"📦 measurement 캐시 최신 상태 ({site_id}, {meta['rows']}행, watermark {meta['watermark']})")
+    else:
+        cached = None  # 메모리 맵 해제 후 파일 교체
+        meta = write_cache(merged, cache_dir, rollup_watermark)
+        refetched = "전체" if days is None else f"{len(days)}일"
+        print(f"📦 measurement 캐시 갱신 ({site_id}): {refetched} {len(fetched['measured_at'])}행 재조회 → "
+              f"총 {meta['rows']}행, watermark {meta['watermark']}")
+
+    df = pd.DataFrame({column: merged[column] for column in VALUE_COLUMNS},
+                      index=pd.DatetimeIndex(merged["measured_at"], name="measured_at"))
+    return df
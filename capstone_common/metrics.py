@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# 공통 예측 오차 지표 (RMSE, MAE, MAPE, R²)
+# -------------------------------
+# 입력은 (origin × horizon) 2차원 배열이며, 1차원은 origin 하나, 스칼라는 예측 하나로 취급합니다.
+# 행 단위 반복 없이 한 번의 배열 연산으로 horizon별 · origin별 · 전체 지표를 함께 계산합니다.
+# - 실제값 또는 예측값이 NaN인 칸은 모든 지표에서 제외
+# - MAPE는 |실제값| <= ZERO_THRESHOLD인 칸을 제외 (제외 후 남는 칸이 없으면 NaN)
+# - R²는 실제값 분산이 0이면 NaN
+
+ZERO_THRESHOLD = 1e-6
+METRIC_NAMES = ["RMSE", "MAE", "MAPE", "R2"]
+
+def _as_2d(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values.reshape(1, -1) if values.ndim < 2 else values
+
+def _reduce(valid, err, abs_pct, pct_mask, actuals, axis):
+    count = valid.sum(axis=axis)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sq_sum = (err ** 2).sum(axis=axis)
+        mean = np.where(valid, actuals, 0.0).sum(axis=axis, keepdims=True) / valid.sum(axis=axis, keepdims=True)
+        ss_tot = (np.where(valid, actuals - mean, 0.0) ** 2).sum(axis=axis)
+        return {
+            "n": count,
+            "RMSE": np.sqrt(sq_sum / count),
+            "MAE": np.abs(err).sum(axis=axis) / count,
+            "MAPE": abs_pct.sum(axis=axis) / pct_mask.sum(axis=axis) * 100,
+            "R2": np.where(ss_tot > 0, 1 - sq_sum / ss_tot, np.nan)
+        }
+
+# 반환: {"per_horizon": DataFrame, "per_origin": DataFrame, "overall": dict}
+def score_forecasts(actuals, forecasts, threshold=ZERO_THRESHOLD):
+    actuals, forecasts = _as_2d(actuals), _as_2d(forecasts)
+    valid = np.isfinite(actuals) & np.isfinite(forecasts)
+    err = np.where(valid, forecasts - actuals, 0.0)
+    pct_mask = valid & (np.abs(actuals) > threshold)
+    abs_pct = np.where(pct_mask, np.abs(err) / np.where(pct_mask, np.abs(actuals), 1.0), 0.0)
+
+    per_horizon = pd.DataFrame(_reduce(valid, err, abs_pct, pct_mask, actuals, axis=0))
+    per_horizon.insert(0, "horizon", np.arange(1, actuals.shape[1] + 1))
+    per_origin = pd.DataFrame(_reduce(valid, err, abs_pct, pct_mask, actuals, axis=1))
+    overall = {name: float(value) for name, value in
+               _reduce(valid.ravel(), err.ravel(), abs_pct.ravel(), pct_mask.ravel(), actuals.ravel(), axis=0).items()}
+    overall["n"] = int(overall["n"])
+    return {"per_horizon": per_horizon, "per_origin": per_origin, "overall": overall}
+
+def horizon_metrics(actuals, forecasts, threshold=ZERO_THRESHOLD):
+    return score_forecasts(actuals, forecasts, threshold)["per_horizon"]
+
+def overall_metrics(actuals, forecasts, threshold=ZERO_THRESHOLD):
+    return score_forecasts(actuals, forecasts, threshold)["overall"]
+
+# DB 저장용: NaN → None
+def to_db_value(value):
+    return None if value is None or not np.isfinite(value) else float(value)
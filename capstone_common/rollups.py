@@ -0,0 +1,145 @@
+import argparse
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+if __package__ in (None, ""):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from capstone_common.db import raw_connection
+from capstone_common.sites import get_site
+
+# -------------------------------
+# measurement 일별 / 월별 집계 테이블 (rollup)
+# -------------------------------
+# 시간 단위 measurement를 저장할 때 같은 트랜잭션에서 해당 날짜의 일별 행과 해당 월의 월별 행을 다시 계산합니다.
+# - 일별: 바뀐 날짜 구간만 (site_id, measured_at) UNIQUE 키 범위 조회로 measurement에서 재집계 (하루 24행)
+# - 월별: 바뀐 월만 measurement_daily에서 재집계 (한 달 최대 31행)
+# - 예측 서비스는 measurement 전체를 GROUP BY 하지 않고 measurement_daily를 바로 읽음
+# 사용법 (저장소 루트에서, 테이블 생성 직후 또는 직접 measurement를 수정한 뒤 구간 재생성):
+#   python -m capstone_common.rollups rebuild [--site muan] [--start 2024-01-01] [--end 2024-12-31]
+
+DAYLIGHT_HOURS = (7, 20)    # 일별 발전량 합계에 포함하는 시각 (SARIMA 학습 대상과 동일)
+
+# 일별 재집계: [start, end) 구간의 날짜별 한 행
+# 예보 열만 저장된 날짜(미래 날짜 등)는 발전량을 0이 아닌 NULL로 둠 (실측이 없는 날을 발전량 0으로 읽지 않도록)
+REFRESH_DAILY_SQL = f"""
+    INSERT INTO measurement_daily (
+        site_id, day, daylight_power_mw, cumulative_min_mwh, cumulative_max_mwh,
+        forecast_irradiance_wm2, forecast_temperature_c, forecast_wind_speed_ms, hours
+    )
+    SELECT
+        site_id, DATE(measured_at),
+        CASE WHEN COUNT(power_mw) > 0
+             THEN SUM(CASE WHEN HOUR(measured_at) BETWEEN {DAYLIGHT_HOURS[0]} AND {DAYLIGHT_HOURS[1]} THEN power_mw ELSE 0 END)
+        END,
+        MIN(cumulative_mwh), MAX(cumulative_mwh),
+        AVG(forecast_irradiance_wm2), AVG(forecast_temperature_c), AVG(forecast_wind_speed_ms),
+        COUNT(*)
+    FROM measurement
+    WHERE site_id = %(site_id)s AND measured_at >= %(start)s AND measured_at < %(end)s
+    GROUP BY site_id, DATE(measured_at)
+    ON DUPLICATE KEY UPDATE
+        daylight_power_mw = VALUES(daylight_power_mw),
+        cumulative_min_mwh = VALUES(cumulative_min_mwh),
+        cumulative_max_mwh = VALUES(cumulative_max_mwh),
+        forecast_irradiance_wm2 = VALUES(forecast_irradiance_wm2),
+        forecast_temperature_c = VALUES(forecast_temperature_c),
+        forecast_wind_speed_ms = VALUES(forecast_wind_speed_ms),
+        hours = VALUES(hours),
+        updated_at = NOW()
+"""
+
+# 월별 재집계: 일별 행에서 계산 (발전량 = 일별 누적 최대 - 최소의 합, 예보 값은 일 평균의 평균)
+REFRESH_MONTHLY_SQL = """
+    INSERT INTO measurement_monthly (
+        site_id, month, generation_mwh, daylight_power_mw,
+        forecast_irradiance_wm2, forecast_temperature_c, forecast_wind_speed_ms, days
+    )
+    SELECT
+        site_id, DATE_SUB(day, INTERVAL DAYOFMONTH(day) - 1 DAY),
+        SUM(cumulative_max_mwh - cumulative_min_mwh), SUM(daylight_power_mw),
+        AVG(forecast_irradiance_wm2), AVG(forecast_temperature_c), AVG(forecast_wind_speed_ms),
+        COUNT(*)
+    FROM measurement_daily
+    WHERE site_id = %(site_id)s AND day >= %(start)s AND day < %(end)s
+    GROUP BY site_id, DATE_SUB(day, INTERVAL DAYOFMONTH(day) - 1 DAY)
+    ON DUPLICATE KEY UPDATE
+        generation_mwh = VALUES(generation_mwh),
+        daylight_power_mw = VALUES(daylight_power_mw),
+        forecast_irradiance_wm2 = VALUES(forecast_irradiance_wm2),
+        forecast_temperature_c = VALUES(forecast_temperature_c),
+        forecast_wind_speed_ms = VALUES(forecast_wind_speed_ms),
+        days = VALUES(days),
+        updated_at = NOW()
+"""
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+def month_start(day):
+    return day.replace(day=1)
+
+def next_month(day):
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+# 저장한 시각 목록이 걸친 날짜 구간 [첫 날, 마지막 날 + 1)과 월 구간을 다시 집계
+# cursor: measurement를 upsert한 pymysql 커서 (commit은 호출한 쪽에서 한 번에)
+# 반환: (갱신한 일별 행 수, 갱신한 월별 행 수) — MySQL 영향 행 수 기준 (신규 1, 변경 2)
+def refresh_rollups(cursor, site_id, measured_at):
+    days = {_as_date(value) for value in measured_at}
+    if not days:
+        return 0, 0
+    first, last = min(days), max(days)
+    daily = cursor.execute(REFRESH_DAILY_SQL, {
+        "site_id": site_id, "start": first, "end": last + timedelta(days=1)
+    })
+    monthly = cursor.execute(REFRESH_MONTHLY_SQL, {
+        "site_id": site_id, "start": month_start(first), "end": next_month(last)
+    })
+    return daily, monthly
+
+# [start, end] 구간 재생성: 한 달씩 나눠 커밋 (긴 구간도 트랜잭션과 잠금이 한 달 범위로 제한됨)
+def rebuild_range(site_id, start=None, end=None):
+    site_id = get_site(site_id)["id"]
+    with raw_connection() as conn:
+        with conn.cursor() as cursor:
+            if start is None or end is None:
+                cursor.execute("SELECT MIN(measured_at), MAX(measured_at) FROM measurement WHERE site_id = %s", (site_id,))
+                first, last = cursor.fetchone()
+                if first is None:
+                    print(f"ℹ️ {site_id}: measurement 데이터 없음")
+                    return 0
+                start = start or first.date()
+                end = end or last.date()
+
+            months = 0
+            current = month_start(start)
+            while current <= end:
+                chunk_start = max(start, current)
+                chunk_end = min(end, next_month(current) - timedelta(days=1))
+                # 구간 안에서 measurement 행이 사라진 날짜도 반영되도록 기존 일별 행을 먼저 지움
+                cursor.execute("DELETE FROM measurement_daily WHERE site_id = %s AND day >= %s AND day <= %s",
+                               (site_id, chunk_start, chunk_end))
+                cursor.execute("DELETE FROM measurement_monthly WHERE site_id = %s AND month = %s", (site_id, current))
+                refresh_rollups(cursor, site_id, [chunk_start, chunk_end])
+                conn.commit()
+                months += 1
+                print(f"✅ {site_id} {chunk_start} ~ {chunk_end} 집계 재생성")
+                current = next_month(current)
+    return months
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m capstone_common.rollups", description="measurement 일별/월별 집계")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rebuild = subparsers.add_parser("rebuild", help="구간 재생성 (생략 시 전체 구간)")
+    rebuild.add_argument("--site", default=None)
+    rebuild.add_argument("--start", type=date.fromisoformat, default=None)
+    rebuild.add_argument("--end", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    months = rebuild_range(args.site, args.start, args.end)
+    print(f"📊 {months}개월 재생성 완료")
+
+
+if __name__ == "__main__":
+    main()
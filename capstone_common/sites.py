@@ -0,0 +1,51 @@
+import json
+import os
+
+# -------------------------------
+# 발전소(사이트) 레지스트리
+# -------------------------------
+# sites.json에 사이트별 좌표·설비용량(kW)·날씨 API 지역 코드·지역명·동시 작업 수 제한을 등록합니다.
+# measurement / forecast_* 테이블의 site_id 값은 여기의 사이트 키를 사용합니다.
+# 다른 파일을 쓰려면 SITES_PATH 환경변수로 경로를 지정합니다.
+
+SITES_PATH = os.environ.get("SITES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "sites.json"))
+REQUIRED_FIELDS = ("name", "lat", "lon", "cap", "weather_loc", "location")
+DEFAULT_MAX_CONCURRENCY = 1
+
+_registry = None
+
+def load_sites(path=SITES_PATH):
+    with open(path, encoding="utf-8") as f:
+        registry = json.load(f)
+    for site_id, site in registry["sites"].items():
+        missing = [field for field in REQUIRED_FIELDS if field not in site]
+        if missing:
+            raise ValueError(f"사이트 '{site_id}' 설정 누락: {', '.join(missing)}")
+        site.setdefault("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+        site["id"] = site_id
+    if registry["default"] not in registry["sites"]:
+        raise ValueError(f"기본 사이트 '{registry['default']}'가 등록되어 있지 않습니다.")
+    return registry
+
+def _get_registry():
+    global _registry
+    if _registry is None:
+        _registry = load_sites()
+    return _registry
+
+def default_site_id():
+    return _get_registry()["default"]
+
+def all_sites():
+    return list(_get_registry()["sites"].values())
+
+def get_site(site_id=None):
+    sites = _get_registry()["sites"]
+    site_id = site_id or default_site_id()
+    if site_id not in sites:
+        raise KeyError(f"등록되지 않은 사이트: {site_id}")
+    return sites[site_id]
+
+# 기상청 태양광 발전량 조회 폼 입력값 (위도, 경도, 설비용량)
+def pvsim_params(site):
+    return {"lat": site["lat"], "lon": site["lon"], "cap": site["cap"]}
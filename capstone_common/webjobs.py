@@ -0,0 +1,118 @@
+import os
+import time
+
+from flask import Blueprint, abort, jsonify, redirect, request, url_for
+
+from capstone_common.jobqueue import JobQueue, job_key
+
+# -------------------------------
+# 웹 요청 → 작업 큐 연결
+# -------------------------------
+# 크롤링·외부 API 호출·모델 학습이 필요한 요청은 요청 스레드에서 실행하지 않고 작업 큐에 등록한 뒤 바로 응답합니다.
+# - 같은 작업(종류 + 인자)이 대기/실행 중이면 새로 등록하지 않고 그 작업 id를 돌려줌 (동시 요청 · 정기 파이프라인 작업과 병합)
+# - /jobs/<id>: 상태(queued/running/done/failed/skipped), 대기 순번, 실행 시간, 결과 조회
+# - HTML 화면은 작업이 끝날 때까지 자동 새로고침 화면을 보여주고, 끝나면 결과로 화면을 그림
+# - /metrics/* 는 작업자 프로세스가 작업 큐에 기록한 지표를 이 웹 프로세스의 지표와 함께 표시
+# 실제 실행은 python -m capstone_common.jobqueue worker 가 담당합니다.
+
+REFRESH_SECONDS = 2
+_queue = None
+
+def get_queue():
+    global _queue
+    if _queue is None:
+        _queue = JobQueue()
+    return _queue
+
+# 반환: (작업 id, 새로 만들었는지 여부)
+def submit_job(kind, args, depends_on=()):
+    return get_queue().enqueue(kind, args, dedup_key=job_key(kind, args), depends_on=depends_on)
+
+# 프로세스별 지표 목록: 이 웹 프로세스(local, None이면 제외) + 작업자 프로세스가 기록한 지표
+def process_metrics_list(name, local=None):
+    rows = get_queue().worker_metrics(name)
+    if local is not None:
+        rows.insert(0, {"worker": f"web:{os.getpid()}", "updated_at": time.time(), "metrics": local})
+    return rows
+
+# 대기 중이면 앞선 작업 수, 실행 중이면 경과 시간, 선행 작업 상태를 함께 반환
+def job_status(job_id):
+    queue = get_queue()
+    job = queue.get(job_id)
+    if job is None:
+        return None
+    status = {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "args": job["args"],
+        "state": job["state"],
+        "attempts": job["attempts"],
+        "max_attempts": job["max_attempts"],
+        "error": job["error"],
+        "result": job["result"],
+        "status_url": url_for("jobs.job_detail", job_id=job["id"])
+    }
+    progress = queue.progress(job_id)
+    if job["state"] == "queued":
+        status["queued_ahead"] = progress["queued_ahead"]
+        status["waiting_on"] = progress["waiting_on"]
+    elif job["state"] == "running" and progress["started_at"]:
+        status["running_seconds"] = round(time.time() - progress["started_at"], 1)
+    if job["finished_at"]:
+        status["total_seconds"] = round(job["finished_at"] - job["created_at"], 1)
+    return status
+
+# 작업이 끝나기 전 화면: REFRESH_SECONDS마다 같은 주소를 다시 열어 상태 확인
+def pending_page(title, status, refresh_url):
+    detail = f"앞선 대기 작업 {status['queued_ahead']}개" if status["state"] == "queued" else \
+        f"실행 {status.get('running_seconds') or 0}초 경과"
+    return f"""
+    <html><head><meta charset='utf-8'><meta http-equiv='refresh' content='{REFRESH_SECONDS};url={refresh_url}'>
+    <title>{title}</title></head>
+    <body style='font-family: sans-serif; padding: 30px;'>
+        <h2>⏳ {title}</h2>
+        <p>작업 #{status['job_id']} ({status['kind']}): {status['state']} - {detail}</p>
+        <p><a href='{status['status_url']}'>작업 상태(JSON)</a></p>
+    </body></html>
+    """
+
+def failed_page(title, status):
+    return f"<h1>🚨 {title} 실패</h1><p>작업 #{status['job_id']} ({status['state']}): {status['error']}</p>"
+
+# HTML 화면 공통 흐름: ?job= 이 없으면 작업을 등록하고 같은 화면(?job=<id>)으로 이동,
+# 작업이 끝나지 않았으면 대기 화면, 실패면 오류 화면, 끝났으면 결과를 반환
+# 반환: (결과, None) 또는 (None, 바로 돌려줄 응답). submit: 작업 id를 돌려주는 함수
+def job_result_or_response(submit, endpoint, title, **url_args):
+    job_id = request.args.get("job", type=int)
+    if job_id is None:
+        return None, redirect(url_for(endpoint, job=submit(), **url_args))
+    status = job_status(job_id)
+    if status is None:
+        abort(404)
+    if status["state"] in ("queued", "running"):
+        return None, pending_page(title, status, url_for(endpoint, job=job_id, **url_args))
+    if status["state"] != "done":
+        return None, failed_page(title, status)
+    return status["result"], None
+
+# JSON API 공통 흐름: ?job= 이 없으면 작업을 등록, 작업 상태를 반환 (대기/실행 중 202, 끝났으면 결과 포함 200)
+def job_json_response(submit):
+    job_id = request.args.get("job", type=int)
+    status = job_status(submit() if job_id is None else job_id)
+    if status is None:
+        abort(404)
+    return jsonify(status), 202 if status["state"] in ("queued", "running") else 200
+
+
+jobs_blueprint = Blueprint("jobs", __name__)
+
+@jobs_blueprint.route("/jobs/<int:job_id>")
+def job_detail(job_id):
+    status = job_status(job_id)
+    if status is None:
+        abort(404)
+    return jsonify(status)
+
+@jobs_blueprint.route("/metrics/jobs")
+def job_metrics():
+    return jsonify(get_queue().runtime_stats())
@@ -0,0 +1,71 @@
+import argparse
+
+from capstone_ml.pipeline import (DATA_DIR, TEST_CSV, TRAIN_CSV, MODEL_LABELS, run_evaluation,
+                                  run_training)
+from capstone_ml.stage_cache import StageCache
+
+# -------------------------------
+# 학습/평가 CLI
+# 사용법 (저장소 루트에서):
+#   python -m capstone_ml train [--models arima sarima] [--workers 8] [--plot]
+#   python -m capstone_ml evaluate [--csv capstone_ml/test.csv] [--plot]
+#   python -m capstone_ml backtest [--models arima sarima lgbm] [--window-days 60] [--workers 8]
+# 기본은 화면 출력 없이(headless) 실행되며, --plot은 그래프를 PNG로 저장, --show는 창으로 표시합니다.
+# -------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m capstone_ml", description="ARIMA/SARIMA 학습 파이프라인")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train = subparsers.add_parser("train", help="모델 학습 및 저장")
+    train.add_argument("--csv", default=TRAIN_CSV)
+    train.add_argument("--output-dir", default=DATA_DIR)
+    train.add_argument("--models", nargs="+", choices=list(MODEL_LABELS), default=list(MODEL_LABELS))
+    train.add_argument("--test-days", type=int, default=7)
+    train.add_argument("--m", type=int, default=24, help="SARIMA 계절 주기")
+    train.add_argument("--workers", type=int, default=None, help="차수 탐색 프로세스 수")
+    train.add_argument("--no-cache", action="store_true", help="단계 캐시를 사용하지 않고 모두 다시 실행")
+
+    evaluate = subparsers.add_parser("evaluate", help="저장된 모델을 테스트 데이터로 평가")
+    evaluate.add_argument("--csv", default=TEST_CSV)
+    evaluate.add_argument("--model-dir", default=DATA_DIR)
+    evaluate.add_argument("--output-dir", default=DATA_DIR)
+    evaluate.add_argument("--metrics-name", default="성능지표_용도별.csv")
+
+    backtest = subparsers.add_parser("backtest", help="rolling-origin 백테스트")
+    backtest.add_argument("--csv", default=TRAIN_CSV)
+    backtest.add_argument("--models", nargs="+", choices=["arima", "sarima", "lgbm"], default=["arima", "sarima", "lgbm"])
+    backtest.add_argument("--horizon", type=int, default=24, help="예측 길이 (시간)")
+    backtest.add_argument("--step", type=int, default=24, help="origin 간격 (시간)")
+    backtest.add_argument("--window-days", type=int, default=60, help="학습 구간 길이 (0이면 expanding)")
+    backtest.add_argument("--min-train-days", type=int, default=60, help="expanding일 때 첫 origin 이전 최소 학습 일수")
+    backtest.add_argument("--max-origins", type=int, default=None, help="최근 N개 origin만 사용")
+    backtest.add_argument("--refit-every", type=int, default=7, help="재학습 간격 (origin 수)")
+    backtest.add_argument("--workers", type=int, default=None)
+    backtest.add_argument("--model-dir", default=DATA_DIR, help="차수를 가져올 저장 모델 위치")
+    backtest.add_argument("--output-dir", default=DATA_DIR)
+
+    for sub in (train, evaluate):
+        sub.add_argument("--plot", action="store_true", help="예측 그래프를 PNG로 저장")
+        sub.add_argument("--show", action="store_true", help="예측 그래프를 창으로 표시")
+
+    args = parser.parse_args()
+    if args.command == "train":
+        results = run_training(args.csv, args.output_dir, models=args.models, test_days=args.test_days,
+                               m=args.m, workers=args.workers, plot=args.plot, show=args.show,
+                               cache=StageCache(enabled=not args.no_cache))
+    elif args.command == "backtest":
+        from capstone_ml.backtest import run_backtest
+
+        results, _ = run_backtest(args.csv, models=args.models, horizon=args.horizon, step=args.step,
+                                  window_days=args.window_days, min_train_days=args.min_train_days,
+                                  max_origins=args.max_origins, refit_every=args.refit_every,
+                                  workers=args.workers, model_dir=args.model_dir, output_dir=args.output_dir)
+    else:
+        results = run_evaluation(args.csv, args.model_dir, args.output_dir, metrics_name=args.metrics_name,
+                                 plot=args.plot, show=args.show)
+    print(results.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+import joblib
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from capstone_common.metrics import score_forecasts
+from capstone_ml.pipeline import DAY_LEN, MODEL_LABELS, TRAIN_CSV, load_dataset, preprocess
+
+# -------------------------------
+# Rolling-origin 백테스트
+# -------------------------------
+# 예측 시점(origin)을 step 간격으로 옮겨 가며 horizon 시간을 예측하고, 실제값과 비교합니다.
+# - window: 학습 구간 길이(시간). None이면 처음부터 origin까지 확장(expanding)
+# - origin을 refit_every개씩 묶어 한 묶음을 하나의 작업으로 프로세스 풀에서 병렬 실행
+# - 묶음 안에서는 첫 origin에서만 학습하고, 이후 origin은 학습된 상태를 재사용
+#   (ARIMA/SARIMA: 같은 파라미터로 새 관측만 필터링, LightGBM: 모델 유지 + 최신 lag로 예측)
+# - 결과는 origin × horizon 2차원 배열이며, horizon별 · origin별 RMSE/MAE/MAPE/R²를 계산 (capstone_common.metrics)
+
+DEFAULT_ORDERS = {
+    "arima": ((2, 1, 2), (0, 0, 0, 0)),
+    "sarima": ((1, 0, 1), (1, 1, 1, DAY_LEN))
+}
+LGBM_LAGS = 48
+LGBM_PARAMS = {"n_estimators": 200, "learning_rate": 0.05, "num_leaves": 31, "verbose": -1}
+LGBM_TRAIN_STRIDE = 3  # 학습용 origin 간격 (행 수 절감)
+
+
+class StateSpaceForecaster:
+    def __init__(self, order, seasonal_order):
+        self.order = order
+        self.seasonal_order = seasonal_order
+
+    def fit(self, train, hours):
+        model = SARIMAX(train, order=self.order, seasonal_order=self.seasonal_order,
+                        enforce_stationarity=False, enforce_invertibility=False)
+        return model.fit(disp=False, low_memory=True)
+
+    def update(self, state, train, hours, n_new, expanding):
+        if expanding:
+            return state.append(train[-n_new:], refit=False)
+        return state.apply(train, refit=False)
+
+    def predict(self, state, train, future_hours):
+        return state.forecast(len(future_hours))
+
+
+# 직접(direct) 다단계 예측: 특징 = origin 직전 LGBM_LAGS개 관측 + 예측 단계 + 대상 시각
+class LightGBMForecaster:
+    def __init__(self, params=None):
+        self.params = dict(LGBM_PARAMS, **(params or {}))
+        self.horizon = None
+
+    def _features(self, lags, steps, target_hours):
+        return np.column_stack([lags, steps, target_hours])
+
+    def fit(self, train, hours):
+        from lightgbm import LGBMRegressor
+
+        horizon = self.horizon
+        windows = sliding_window_view(train, LGBM_LAGS)
+        ends = np.arange(LGBM_LAGS, len(train) - horizon + 1, LGBM_TRAIN_STRIDE)
+        steps = np.arange(1, horizon + 1)
+        lags = np.repeat(windows[ends - LGBM_LAGS], horizon, axis=0)
+        target_idx = (ends[:, None] + steps[None, :] - 1).ravel()
+        X = self._features(lags, np.tile(steps, len(ends)), hours[target_idx])
+        model = LGBMRegressor(**self.params)
+        model.fit(X, train[target_idx])
+        return model
+
+    def update(self, state, train, hours, n_new, expanding):
+        return state
+
+    def predict(self, state, train, future_hours):
+        horizon = len(future_hours)
+        lags = np.repeat(train[-LGBM_LAGS:][None, :], horizon, axis=0)
+        return state.predict(self._features(lags, np.arange(1, horizon + 1), future_hours))
+
+
+def build_forecaster(name, spec, horizon):
+    if name == "lgbm":
+        forecaster = LightGBMForecaster(spec)
+        forecaster.horizon = horizon
+        return forecaster
+    order, seasonal_order = spec
+    return StateSpaceForecaster(order, seasonal_order)
+
+# 저장된 pmdarima 모델이 있으면 그 차수를, 없으면 기본 차수를 사용
+def model_spec(name, model_dir=None):
+    if name == "lgbm":
+        return None
+    path = os.path.join(model_dir, f"{name}_model.pkl") if model_dir else None
+    if path and os.path.exists(path):
+        model = joblib.load(path)
+        return tuple(model.order), tuple(model.seasonal_order)
+    return DEFAULT_ORDERS[name]
+
+# -------------------------------
+# 작업자 프로세스
+# -------------------------------
+_worker_y = None
+_worker_hours = None
+
+def _init_worker(y, hours):
+    global _worker_y, _worker_hours
+    _worker_y, _worker_hours = y, hours
+    warnings.simplefilter("ignore")
+
+def _run_group(name, spec, origins, horizon, window):
+    forecaster = build_forecaster(name, spec, horizon)
+    forecasts = np.full((len(origins), horizon), np.nan)
+    state, previous = None, None
+    fits, started = 0, perf_counter()
+    for i, origin in enumerate(origins):
+        start = 0 if window is None else max(0, origin - window)
+        train, hours = _worker_y[start:origin], _worker_hours[start:origin]
+        try:
+            if state is None:
+                state = forecaster.fit(train, hours)
+                fits += 1
+            else:
+                state = forecaster.update(state, train, hours, origin - previous, window is None)
+            forecasts[i] = forecaster.predict(state, train, _worker_hours[origin:origin + horizon])
+        except Exception as e:
+            print(f"⚠️ {name} origin {origin} 실패: {e}")
+            state = None
+        previous = origin
+    return forecasts, fits, perf_counter() - started
+
+def make_origins(n, horizon, step, min_train, max_origins=None):
+    origins = np.arange(min_train, n - horizon + 1, step)
+    return origins[-max_origins:] if max_origins else origins
+
+def run_backtest(csv_path=TRAIN_CSV, models=("arima", "sarima", "lgbm"), horizon=DAY_LEN, step=DAY_LEN,
+                 window_days=60, min_train_days=60, max_origins=None, refit_every=7, workers=None,
+                 model_dir=None, output_dir=None):
+    series = preprocess(load_dataset(csv_path)[0])
+    y = series.to_numpy(dtype=np.float64)
+    hours = series.index.hour.to_numpy(dtype=np.float64)
+    window = window_days * DAY_LEN if window_days else None
+    origins = make_origins(len(y), horizon, step, window or min_train_days * DAY_LEN, max_origins)
+    if len(origins) == 0:
+        raise ValueError("백테스트할 origin이 없습니다. horizon/min_train_days를 확인하세요.")
+
+    actuals = y[origins[:, None] + np.arange(horizon)[None, :]]
+    groups = [origins[i:i + refit_every] for i in range(0, len(origins), refit_every)]
+    print(f"🔁 백테스트: origin {len(origins)}개 ({series.index[origins[0]]} ~ {series.index[origins[-1]]}), "
+          f"horizon {horizon}, {'rolling ' + str(window_days) + '일' if window else 'expanding'}, "
+          f"{len(groups)}개 작업")
+
+    reports = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(y, hours)) as executor:
+        for name in models:
+            spec = model_spec(name, model_dir)
+            started = perf_counter()
+            results = list(executor.map(_run_group, [name] * len(groups), [spec] * len(groups), groups,
+                                        [horizon] * len(groups), [window] * len(groups)))
+            forecasts = np.vstack([r[0] for r in results])
+            scores = score_forecasts(actuals, forecasts)
+            elapsed = perf_counter() - started
+            fits = sum(r[1] for r in results)
+            label = MODEL_LABELS.get(name, "LightGBM")
+            print(f"✅ {label}: {elapsed:.1f}s (학습 {fits}회, 작업 시간 합계 {sum(r[2] for r in results):.1f}s) "
+                  f"RMSE {scores['overall']['RMSE']:.2f}")
+
+            scores["per_origin"].insert(0, "origin", series.index[origins])
+            reports[name] = dict(scores, forecasts=forecasts, actuals=actuals, fits=fits, seconds=elapsed)
+            if output_dir:
+                scores["per_horizon"].to_csv(os.path.join(output_dir, f"backtest_{name}_horizon.csv"), index=False)
+                scores["per_origin"].to_csv(os.path.join(output_dir, f"backtest_{name}_origin.csv"), index=False)
+
+    summary = pd.DataFrame([dict(model=name, origins=len(origins), fits=r["fits"], seconds=round(r["seconds"], 2),
+                                 **r["overall"]) for name, r in reports.items()])
+    if output_dir:
+        summary.to_csv(os.path.join(output_dir, "backtest_summary.csv"), index=False)
+    return summary, reports
@@ -0,0 +1,41 @@
+# -------------------------------
+# CSV 직접 파싱 vs 열 단위 캐시(메모리 맵) 로딩 시간 비교
+# 사용법 (저장소 루트에서): python capstone_ml/bench_dataset.py [CSV 경로]
+# -------------------------------
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from capstone_ml.dataset import open_dataset
+from capstone_ml.pipeline import TRAIN_CSV, TARGET_COLUMN, preprocess
+
+# 기존 arima.py의 로딩 방식
+def load_legacy(path):
+    df = pd.read_csv(path, encoding='utf-8')
+    df['날짜'] = pd.to_datetime(df['날짜'], format='%Y%m%d')
+    df['시간'] = df['시간'].str.replace('시', '').astype(int).astype(str)
+    df['datetime'] = pd.to_datetime(df['날짜'].dt.strftime('%Y-%m-%d') + ' ' + df['시간'] + ':00')
+    df.set_index('datetime', inplace=True)
+    df[TARGET_COLUMN] = pd.to_numeric(df[TARGET_COLUMN], errors='coerce')
+    return df[TARGET_COLUMN].dropna()
+
+def timed(label, fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        started = perf_counter()
+        result = fn()
+        times.append(perf_counter() - started)
+    print(f"⏱ {label}: 최소 {min(times) * 1000:.1f}ms / 평균 {np.mean(times) * 1000:.1f}ms")
+    return result, min(times)
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else TRAIN_CSV
+    open_dataset(path)  # 캐시가 없으면 생성
+    legacy, legacy_time = timed("CSV 파싱", lambda: load_legacy(path))
+    cached, cached_time = timed("캐시 로딩", lambda: preprocess(open_dataset(path)[0]))
+    same = legacy.index.equals(cached.index) and np.allclose(legacy.to_numpy(), cached.to_numpy())
+    print(f"🚀 속도 향상: {legacy_time / cached_time:.1f}배, 결과 일치: {same}")
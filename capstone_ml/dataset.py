@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import shutil
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from capstone_ml.stage_cache import hash_file
+
+# -------------------------------
+# 시간별 CSV 데이터셋 열 단위 캐시
+# -------------------------------
+# CSV를 한 번만 파싱하여 datetime64 인덱스와 수치 열을 열마다 .npy 파일로 저장하고,
+# 이후에는 메모리 맵(mmap_mode="r")으로 복사 없이 읽습니다.
+# 원본의 mtime/크기가 그대로면 바로 사용하고, 달라졌으면 내용 해시를 비교하여
+# 해시가 같으면 메타 정보만 갱신, 다르면 캐시를 다시 만듭니다.
+
+DATASET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "datasets")
+
+DATE_COLUMN = "날짜"
+HOUR_COLUMN = "시간"
+INDEX_FILE = "datetime.npy"
+
+def _cache_dir(csv_path, root):
+    source = os.path.abspath(csv_path)
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(root, f"{os.path.splitext(os.path.basename(source))[0]}_{digest}")
+
+def _read_meta(cache_dir):
+    meta_path = os.path.join(cache_dir, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _write_meta(cache_dir, meta):
+    meta_path = os.path.join(cache_dir, "meta.json")
+    with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(meta_path + ".tmp", meta_path)
+
+# 🔹 '날짜'(YYYYMMDD) + '시간'(N시) → datetime64, 한 번의 변환으로 처리
+def parse_datetime(df):
+    hours = df[HOUR_COLUMN].astype(str).str.replace("시", "").astype(int).to_numpy()
+    days = pd.to_datetime(df[DATE_COLUMN].astype(str), format="%Y%m%d").to_numpy()
+    return days + hours.astype("timedelta64[h]")
+
+def build_dataset(csv_path, cache_dir):
+    started = perf_counter()
+    df = pd.read_csv(csv_path, encoding="utf-8", na_values=["-"])
+    columns = [c for c in df.columns if c not in (DATE_COLUMN, HOUR_COLUMN)]
+
+    # 임시 디렉터리에 모두 쓴 뒤 교체
+    tmp_dir = cache_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    np.save(os.path.join(tmp_dir, INDEX_FILE), parse_datetime(df).astype("datetime64[ns]"))
+    files = {}
+    for i, column in enumerate(columns):
+        files[column] = f"c{i}.npy"
+        np.save(os.path.join(tmp_dir, files[column]), pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64))
+
+    stat = os.stat(csv_path)
+    meta = {
+        "source": os.path.abspath(csv_path),
+        "source_hash": hash_file(csv_path),
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_size": stat.st_size,
+        "rows": int(len(df)),
+        "columns": files
+    }
+    _write_meta(tmp_dir, meta)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+    print(f"📦 데이터셋 캐시 생성: {os.path.basename(csv_path)} ({meta['rows']}행, {perf_counter() - started:.2f}s)")
+    return meta
+
+# 반환: (열 이름 → 배열, meta). 배열은 읽기 전용 메모리 맵
+def open_dataset(csv_path, root=DATASET_DIR, mmap=True):
+    cache_dir = _cache_dir(csv_path, root)
+    meta = _read_meta(cache_dir)
+    stat = os.stat(csv_path)
+
+    if meta is None:
+        meta = build_dataset(csv_path, cache_dir)
+    elif (meta["source_mtime_ns"], meta["source_size"]) != (stat.st_mtime_ns, stat.st_size):
+        if hash_file(csv_path) == meta["source_hash"]:
+            meta.update(source_mtime_ns=stat.st_mtime_ns, source_size=stat.st_size)
+            _write_meta(cache_dir, meta)
+        else:
+            meta = build_dataset(csv_path, cache_dir)
+
+    mmap_mode = "r" if mmap else None
+    arrays = {"datetime": np.load(os.path.join(cache_dir, INDEX_FILE), mmap_mode=mmap_mode)}
+    for column, file_name in meta["columns"].items():
+        arrays[column] = np.load(os.path.join(cache_dir, file_name), mmap_mode=mmap_mode)
+    return arrays, meta
+
+# 메모리 맵 배열을 그대로 감싼 Series (복사 없음)
+def column_series(arrays, column):
+    index = pd.DatetimeIndex(arrays["datetime"], name="datetime", copy=False)
+    return pd.Series(arrays[column], index=index, name=column, copy=False)
+
+def load_frame(csv_path, columns=None, root=DATASET_DIR):
+    arrays, meta = open_dataset(csv_path, root)
+    columns = columns or list(meta["columns"])
+    return pd.DataFrame({column: arrays[column] for column in columns},
+                        index=pd.DatetimeIndex(arrays["datetime"], name="datetime"))
@@ -0,0 +1,182 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+import numpy as np
+import pmdarima as pm
+from pmdarima.arima import ndiffs, nsdiffs
+
+# -------------------------------
+# 병렬 (p,d,q)(P,D,Q,m) 차수 탐색
+# -------------------------------
+# auto_arima(stepwise=True)와 같은 방식으로 현재 최적 차수의 이웃(p, q, P, Q ±1)을 탐색하되,
+# 한 라운드의 후보를 프로세스 풀에서 동시에 학습합니다.
+# - 이미 평가한 차수는 데이터 해시별로 캐시 파일에 저장하여 다시 학습하지 않음
+# - 라운드에서 정보 기준(IC)이 min_improvement 이상 개선되지 않으면 조기 종료
+# - 모든 평가 결과(라운드, 차수, IC, 소요 시간, 캐시 여부)는 trace CSV로 저장
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "order_search_cache.json")
+
+_worker_y = None
+
+def _init_worker(y):
+    global _worker_y
+    _worker_y = y
+    warnings.simplefilter("ignore")
+
+def _evaluate(order, seasonal_order, information_criterion):
+    started = perf_counter()
+    try:
+        model = pm.ARIMA(order=order, seasonal_order=seasonal_order, suppress_warnings=True)
+        model.fit(_worker_y)
+        ic = float(getattr(model, information_criterion)())
+        status = "ok" if np.isfinite(ic) else "non_finite"
+    except Exception as e:
+        ic, status = float("inf"), f"error: {e}"
+    return order, seasonal_order, ic, perf_counter() - started, status
+
+def data_hash(y, m):
+    digest = hashlib.sha256(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+    digest.update(str(m).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+def _cache_key(order, seasonal_order, information_criterion):
+    return f"{order}|{seasonal_order}|{information_criterion}"
+
+def load_cache(path, key):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get(key, {})
+
+def save_cache(path, key, entries):
+    if not path:
+        return
+    cache = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    cache[key] = entries
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1)
+    os.replace(tmp_path, path)
+
+def neighbours(order, seasonal_order, max_p, max_q, max_P, max_Q):
+    (p, d, q), (P, D, Q, m) = order, seasonal_order
+    result = []
+    for dp, dq, dP, dQ in [(1, 0, 0, 0), (-1, 0, 0, 0), (0, 1, 0, 0), (0, -1, 0, 0),
+                           (0, 0, 1, 0), (0, 0, -1, 0), (0, 0, 0, 1), (0, 0, 0, -1),
+                           (1, 1, 0, 0), (-1, -1, 0, 0)]:
+        np_, nq, nP, nQ = p + dp, q + dq, P + dP, Q + dQ
+        if 0 <= np_ <= max_p and 0 <= nq <= max_q and 0 <= nP <= max_P and 0 <= nQ <= max_Q:
+            result.append(((np_, d, nq), (nP, D, nQ, m)))
+    return result
+
+def parallel_auto_arima(y, m=24, seasonal=True, d=None, D=None, max_p=5, max_q=5, max_P=2, max_Q=2,
+                        information_criterion="aic", workers=None, max_rounds=20, min_improvement=1e-3,
+                        cache_path=CACHE_PATH, trace_path=None):
+    y = np.asarray(y, dtype=np.float64)
+    if not seasonal:
+        m, max_P, max_Q = 1, 0, 0
+    d = ndiffs(y) if d is None else d
+    D = (nsdiffs(y, m=m) if m > 1 else 0) if D is None else D
+
+    key = data_hash(y, m)
+    cache = load_cache(cache_path, key)
+    trace = []
+    evaluated = {}
+
+    # auto_arima stepwise의 초기 후보와 동일
+    initial = [((2, d, 2), (1, D, 1, m)), ((0, d, 0), (0, D, 0, m)),
+               ((1, d, 0), (1, D, 0, m)), ((0, d, 1), (0, D, 1, m))]
+    if not seasonal:
+        initial = [((p, dd, q), (0, 0, 0, 0)) for (p, dd, q), _ in initial]
+    candidates = [(o, s) for o, s in initial if o[0] <= max_p and o[2] <= max_q]
+
+    started = perf_counter()
+    best = None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(y,)) as executor:
+        for round_no in range(1, max_rounds + 1):
+            futures = []
+            for order, seasonal_order in candidates:
+                if (order, seasonal_order) in evaluated:
+                    continue
+                cache_key = _cache_key(order, seasonal_order, information_criterion)
+                if cache_key in cache:
+                    evaluated[(order, seasonal_order)] = cache[cache_key]
+                    trace.append({"round": round_no, "order": order, "seasonal_order": seasonal_order,
+                                  "ic": cache[cache_key], "seconds": 0.0, "cached": True, "status": "cached"})
+                    continue
+                evaluated[(order, seasonal_order)] = None
+                futures.append(executor.submit(_evaluate, order, seasonal_order, information_criterion))
+
+            for future in as_completed(futures):
+                order, seasonal_order, ic, seconds, status = future.result()
+                evaluated[(order, seasonal_order)] = ic
+                if status == "ok":
+                    cache[_cache_key(order, seasonal_order, information_criterion)] = ic
+                trace.append({"round": round_no, "order": order, "seasonal_order": seasonal_order,
+                              "ic": ic, "seconds": round(seconds, 3), "cached": False, "status": status})
+                print(f"  [{round_no}] ARIMA{order}{seasonal_order} {information_criterion}={ic:.2f} ({seconds:.1f}s)")
+            save_cache(cache_path, key, cache)
+
+            round_best = min(((ic, o, s) for (o, s), ic in evaluated.items() if ic is not None),
+                             default=None, key=lambda item: item[0])
+            if round_best is None:
+                break
+            if best is not None and best[0] - round_best[0] < min_improvement:
+                print(f"⏹ 조기 종료: {round_no}라운드에서 {information_criterion} 개선 없음")
+                break
+            best = round_best
+            candidates = neighbours(best[1], best[2], max_p, max_q, max_P, max_Q)
+
+    elapsed = perf_counter() - started
+    if best is None or not np.isfinite(best[0]):
+        raise ValueError("유효한 ARIMA 차수를 찾지 못했습니다.")
+    if trace_path:
+        write_trace(trace_path, trace)
+    print(f"✅ 최적 차수: ARIMA{best[1]}{best[2]} {information_criterion}={best[0]:.2f} "
+          f"(평가 {len(trace)}개, {elapsed:.1f}s)")
+
+    model = pm.ARIMA(order=best[1], seasonal_order=best[2], suppress_warnings=True)
+    model.fit(y)
+    return model, trace
+
+def write_trace(path, trace):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["round", "order", "seasonal_order", "ic", "seconds", "cached", "status"])
+        writer.writeheader()
+        writer.writerows(trace)
+
+
+if __name__ == "__main__":
+    import sys
+
+    import joblib
+
+    parser = argparse.ArgumentParser(description="병렬 SARIMA 차수 탐색 및 모델 저장")
+    parser.add_argument("--csv", default="목포대_태양광_예측_2024_2025.csv")
+    parser.add_argument("--m", type=int, default=24, help="계절 주기 (시간 단위 데이터는 24)")
+    parser.add_argument("--non-seasonal", action="store_true", help="비계절 ARIMA로 탐색")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--test-days", type=int, default=7, help="학습에서 제외할 최근 일수")
+    parser.add_argument("--output", default="sarima_model.pkl")
+    parser.add_argument("--trace", default="order_search_trace.csv")
+    args = parser.parse_args()
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from capstone_ml.pipeline import load_dataset, preprocess
+
+    series = preprocess(load_dataset(args.csv)[0])
+    train = series[:-24 * args.test_days]
+
+    model, _ = parallel_auto_arima(train, m=args.m, seasonal=not args.non_seasonal,
+                                   workers=args.workers, trace_path=args.trace)
+    joblib.dump(model, args.output)
+    print(f"✅ 모델 저장 완료: '{args.output}', 탐색 기록: '{args.trace}'")
@@ -0,0 +1,153 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from pmdarima import auto_arima
+
+from capstone_common.metrics import overall_metrics
+from capstone_ml.dataset import column_series, open_dataset
+from capstone_ml.order_search import parallel_auto_arima
+from capstone_ml.stage_cache import StageCache, stage_key
+
+# -------------------------------
+# 학습 파이프라인: 로드 → 전처리 → 학습 → 평가 → 저장
+# -------------------------------
+# arima.py / test.py / test1.py가 import 시점에 하던 작업을 함수로 나누었습니다.
+# 각 함수는 화면 출력(plt.show) 없이 동작하며, 시각화는 plot/show를 지정한 경우에만 matplotlib을 불러옵니다.
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+TRAIN_CSV = os.path.join(DATA_DIR, "목포대_태양광_예측_2024_2025.csv")
+TEST_CSV = os.path.join(DATA_DIR, "test.csv")
+
+TARGET_COLUMN = "오늘 누적(kWh)"
+
+DAY_LEN = 24
+ARIMA_DAYS = 1   # 익일 예측
+SARIMA_DAYS = 6  # 2~7일 예측
+
+MODEL_LABELS = {"arima": "ARIMA", "sarima": "SARIMA"}
+
+# 🔹 로드: CSV를 열 단위 캐시로 변환해 두고 메모리 맵으로 읽음 (dataset.py)
+def load_dataset(path):
+    return open_dataset(path)
+
+# 🔹 전처리: datetime 인덱스의 누적 발전량 시계열, 결측('-') 제거
+def preprocess(arrays):
+    return column_series(arrays, TARGET_COLUMN).dropna()
+
+# 🔹 학습/테스트 분리 (최근 test_days일 테스트)
+def split_train_test(series, test_days=7):
+    return series[:-DAY_LEN * test_days], series[-DAY_LEN * test_days:]
+
+# 🔹 학습
+def train_arima(train):
+    return auto_arima(train.to_numpy(), seasonal=False, stepwise=True, suppress_warnings=True)
+
+def train_sarima(train, m=24, workers=None, trace_path=None):
+    model, _ = parallel_auto_arima(train, m=m, workers=workers, trace_path=trace_path)
+    return model
+
+# 🔹 평가: 지표 정의(0 값 처리 포함)는 capstone_common.metrics와 동일
+def evaluate_model(name, y_true, y_pred, verbose=True):
+    scores = overall_metrics(y_true, y_pred)
+    if verbose:
+        print(f"[{name} 성능]")
+        print(f"RMSE : {scores['RMSE']:.2f}")
+        print(f"MAE  : {scores['MAE']:.2f}")
+        print(f"MAPE : {scores['MAPE']:.2f}%")
+        print(f"R²   : {scores['R2']:.4f}\n")
+    return {'모델': name, 'RMSE': scores['RMSE'], 'MAE': scores['MAE'], 'MAPE': scores['MAPE'], 'R2': scores['R2']}
+
+# 🔹 저장
+def persist(model, path):
+    joblib.dump(model, path)
+    print(f"✅ 모델 저장 완료: '{path}'")
+
+# 🔹 시각화 (요청한 경우에만 matplotlib import)
+def plot_forecast(y_true, y_pred, label, title, path=None, show=False):
+    import matplotlib
+    if not show:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.rcParams['font.family'] = 'Malgun Gothic'  # 한글 폰트 설정
+    plt.rcParams['axes.unicode_minus'] = False
+    plt.figure(figsize=(14, 6))
+    plt.plot(y_true.index, y_true, label=f'실제 발전량 ({label})', color='black')
+    plt.plot(y_true.index, y_pred, label=f'{label} 예측', linestyle='--')
+    plt.title(title)
+    plt.xlabel('시간')
+    plt.ylabel('발전량 (kWh)')
+    plt.legend()
+    plt.tight_layout()
+    if path:
+        plt.savefig(path, dpi=300)
+    if show:
+        plt.show()
+    plt.close()
+
+# -------------------------------
+# 학습 실행 (arima.py)
+# -------------------------------
+# 입력 CSV 내용과 모델 파라미터가 같으면 학습을 건너뜁니다.
+def run_training(csv_path=TRAIN_CSV, output_dir=DATA_DIR, models=("arima", "sarima"), test_days=7, m=24,
+                 workers=None, plot=False, show=False, cache=None):
+    cache = cache or StageCache()
+    arrays, meta = load_dataset(csv_path)
+    series = preprocess(arrays)
+    preprocess_key = stage_key("preprocess", meta["source_hash"])
+    train, test = split_train_test(series, test_days)
+
+    trainers = {
+        "arima": lambda: train_arima(train),
+        "sarima": lambda: train_sarima(train, m=m, workers=workers,
+                                       trace_path=os.path.join(output_dir, "order_search_trace.csv"))
+    }
+    results = []
+    for name in models:
+        label = MODEL_LABELS[name]
+        print(f"\n=== {label} 모델 ===")
+        params = {"test_days": test_days, "m": m} if name == "sarima" else {"test_days": test_days}
+        model = cache.run(f"train_{name}", stage_key(preprocess_key, name, params), trainers[name])
+
+        forecast = pd.Series(np.asarray(model.predict(n_periods=len(test))), index=test.index)
+        results.append(evaluate_model(label, test, forecast))
+        persist(model, os.path.join(output_dir, f"{name}_model.pkl"))
+        if plot or show:
+            plot_path = os.path.join(output_dir, f"{label}_학습_예측그래프.png") if plot else None
+            plot_forecast(test, forecast, label, f'{label} 예측 결과', path=plot_path, show=show)
+
+    for stage, hit, seconds in cache.timings:
+        print(f"⏱ {stage}: {seconds:.2f}s{' (캐시)' if hit else ''}")
+    return pd.DataFrame(results)
+
+# -------------------------------
+# 저장된 모델 평가 (test.py / test1.py)
+# -------------------------------
+# ARIMA는 테스트 구간 첫날(익일), SARIMA는 이후 6일(2~7일)을 예측하여 비교합니다.
+def run_evaluation(csv_path=TEST_CSV, model_dir=DATA_DIR, output_dir=DATA_DIR,
+                   metrics_name="성능지표_용도별.csv", plot=False, show=False):
+    y_test_full = preprocess(load_dataset(csv_path)[0])
+    horizons = {
+        "arima": (y_test_full[:DAY_LEN * ARIMA_DAYS], "익일", "ARIMA 익일 예측 결과"),
+        "sarima": (y_test_full[DAY_LEN * ARIMA_DAYS:DAY_LEN * (ARIMA_DAYS + SARIMA_DAYS)], "2~7일",
+                   "SARIMA 중단기 예측 결과 (2~7일)")
+    }
+
+    results = []
+    for name, (y_true, period, title) in horizons.items():
+        label = MODEL_LABELS[name]
+        model = joblib.load(os.path.join(model_dir, f"{name}_model.pkl"))
+        y_pred = np.asarray(model.predict(n_periods=len(y_true)))
+        results.append(evaluate_model(f"{label} ({period})", y_true, y_pred))
+
+        pd.DataFrame({'실제 발전량': y_true.values, f'{label} 예측': y_pred},
+                     index=y_true.index).to_csv(os.path.join(output_dir, f"예측_{label}_{period}.csv"))
+        if plot or show:
+            plot_path = os.path.join(output_dir, f"{label}_예측그래프.png") if plot else None
+            plot_forecast(y_true, y_pred, label, title, path=plot_path, show=show)
+
+    results_df = pd.DataFrame(results)
+    results_df.to_csv(os.path.join(output_dir, metrics_name), index=False)
+    return results_df
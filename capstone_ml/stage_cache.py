@@ -0,0 +1,56 @@
+import hashlib
+import json
+import os
+from time import perf_counter
+
+import joblib
+
+# -------------------------------
+# 학습 파이프라인 단계별 결과 캐시
+# -------------------------------
+# 단계 입력의 해시(입력 파일 내용 + 이전 단계 키 + 파라미터)를 키로 결과를 저장합니다.
+# 키가 같으면 함수를 실행하지 않고 저장된 결과를 읽으므로, 입력이 바뀌지 않은 단계는 건너뜁니다.
+# 단계마다 최신 결과 하나만 남깁니다.
+
+STAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "stages")
+
+def hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def stage_key(*parts):
+    return hashlib.sha256(json.dumps(parts, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+class StageCache:
+    def __init__(self, root=STAGE_DIR, enabled=True):
+        self.root = root
+        self.enabled = enabled
+        self.timings = []  # (단계, 캐시 사용 여부, 소요 시간)
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, stage, key):
+        return os.path.join(self.root, f"{stage}_{key}.pkl")
+
+    def run(self, stage, key, fn):
+        started = perf_counter()
+        path = self._path(stage, key)
+        if self.enabled and os.path.exists(path):
+            result = joblib.load(path)
+            self.timings.append((stage, True, perf_counter() - started))
+            print(f"♻️ {stage}: 입력 변경 없음, 캐시 사용")
+            return result
+
+        result = fn()
+        if self.enabled:
+            tmp_path = path + ".tmp"
+            joblib.dump(result, tmp_path)
+            os.replace(tmp_path, path)
+            for name in os.listdir(self.root):
+                if name.startswith(f"{stage}_") and name.endswith(".pkl") and name != os.path.basename(path):
+                    os.remove(os.path.join(self.root, name))
+        self.timings.append((stage, False, perf_counter() - started))
+        return result
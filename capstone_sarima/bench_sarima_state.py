@@ -0,0 +1,44 @@
+# -------------------------------
+# SARIMA 전체 재추정 vs 상태 append 지연 시간 비교 (이력 길이별)
+# 사용법: python bench_sarima_state.py [이력 일수 ...]
+# 합성 일별 발전량(주간 계절성 + 잡음)으로 재추정, 1일 append, 7일 예측 시간을 측정합니다.
+# -------------------------------
+import os
+import sys
+import tempfile
+import warnings
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sarima_state import SarimaStateStore
+
+def synthetic_daily(days, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(days + 1)
+    values = 2000 + 600 * np.sin(2 * np.pi * t / 365) + 150 * np.sin(2 * np.pi * t / 7) + rng.normal(0, 80, len(t))
+    return pd.Series(values, index=pd.date_range("2022-01-01", periods=len(t), freq="D"))
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    lengths = [int(v) for v in sys.argv[1:]] or [180, 365, 730, 1095]
+    print(f"{'이력(일)':>8} | {'재추정(s)':>9} | {'append(s)':>9} | {'예측 7일(s)':>10}")
+    for days in lengths:
+        y = synthetic_daily(days)
+        store = SarimaStateStore((2, 1, 2), (1, 1, 1, 7), state_dir=tempfile.mkdtemp())
+
+        started = perf_counter()
+        store.update(y.iloc[:-1])
+        refit_s = perf_counter() - started
+
+        started = perf_counter()
+        results = store.update(y)
+        append_s = perf_counter() - started
+        assert store.last_update["mode"] == "append", store.last_update
+
+        started = perf_counter()
+        results.forecast(steps=7)
+        forecast_s = perf_counter() - started
+        print(f"{days:>8} | {refit_s:>9.3f} | {append_s:>9.3f} | {forecast_s:>10.3f}")
@@ -0,0 +1,126 @@
+import json
+import os
+from datetime import date, datetime
+from time import perf_counter
+
+import numpy as np
+import pytz
+from statsmodels.iolib.smpickle import load_pickle
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from capstone_common.filelock import FileLock
+
+# -------------------------------
+# SARIMAX 학습 상태 캐시
+# -------------------------------
+# 학습된 SARIMAX 결과를 파일로 저장해 두고, 새 일별 관측이 들어오면 MLE 없이
+# 기존 파라미터로 상태만 앞으로 필터링(append, refit=False)합니다.
+# 전체 재추정은 아래 경우에만 수행하며, 이때 직전 파라미터를 초기값으로 사용합니다.
+# - 마지막 재추정 후 REFIT_EVERY_DAYS일 경과
+# - 새 관측의 예측 오차가 학습 잔차 표준편차의 DRIFT_THRESHOLD배를 넘는 경우
+# - 이미 반영된 과거 관측값이 바뀐 경우 (backfill 등)
+# 상태 파일마다 잠금 파일(.lock)을 두어, 여러 프로세스가 같은 사이트를 갱신해도 한 번에 하나만 읽고-재추정하고-저장합니다.
+# 결과(.pkl)와 메타(.json)는 프로세스별 임시 파일에 쓴 뒤 교체하므로 읽는 쪽에서 쓰다 만 파일을 보지 않습니다.
+
+STATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+REFIT_EVERY_DAYS = 7
+DRIFT_THRESHOLD = 3.0
+KST = pytz.timezone("Asia/Seoul")    # 재추정 주기는 서버 시간대와 관계없이 한국 날짜 기준
+
+
+class SarimaStateStore:
+    def __init__(self, order, seasonal_order, state_dir=STATE_DIR, name="sarima_daily",
+                 refit_every_days=REFIT_EVERY_DAYS, drift_threshold=DRIFT_THRESHOLD):
+        self.order = order
+        self.seasonal_order = seasonal_order
+        self.refit_every_days = refit_every_days
+        self.drift_threshold = drift_threshold
+        self.results_path = os.path.join(state_dir, f"{name}.pkl")
+        self.meta_path = os.path.join(state_dir, f"{name}.json")
+        self.lock = FileLock(os.path.join(state_dir, f"{name}.lock"))
+        self.last_update = None  # 마지막 호출의 처리 방식과 소요 시간
+        os.makedirs(state_dir, exist_ok=True)
+
+    def _load(self):
+        if not (os.path.exists(self.results_path) and os.path.exists(self.meta_path)):
+            return None, None
+        with open(self.meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("order") != list(self.order) or meta.get("seasonal_order") != list(self.seasonal_order):
+            return None, None
+        return load_pickle(self.results_path), meta
+
+    def _save(self, results, meta):
+        tmp_path = f"{self.results_path}.{os.getpid()}.tmp"
+        results.save(tmp_path)
+        os.replace(tmp_path, self.results_path)
+        meta.update({
+            "order": list(self.order),
+            "seasonal_order": list(self.seasonal_order),
+            "n_obs": int(results.nobs),
+            "last_obs": str(results.model.data.row_labels[-1].date()),
+            "resid_std": float(np.nanstd(results.resid[self._burn_in(results):]))
+        })
+        tmp_meta = f"{self.meta_path}.{os.getpid()}.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_meta, self.meta_path)
+
+    # 차분/계절 차분으로 초기 잔차가 크게 나오는 구간은 잔차 통계에서 제외
+    def _burn_in(self, results):
+        return self.order[1] + self.seasonal_order[1] * self.seasonal_order[3]
+
+    def fit(self, y, start_params=None):
+        model = SARIMAX(y, order=self.order, seasonal_order=self.seasonal_order,
+                        enforce_stationarity=False, enforce_invertibility=False)
+        return model.fit(start_params=start_params, disp=False)
+
+    def _refit(self, y, previous, reason, started):
+        start_params = previous.params if previous is not None else None
+        results = self.fit(y, start_params=start_params)
+        self._save(results, {"last_refit": datetime.now(KST).date().isoformat()})
+        self.last_update = {"mode": "refit", "reason": reason, "seconds": round(perf_counter() - started, 3)}
+        return results
+
+    # y: 일 단위(freq="D") 학습 시계열, 반환값은 예측에 바로 사용할 수 있는 결과 객체
+    def update(self, y, force_refit=False):
+        with self.lock:
+            return self._update(y, force_refit)
+
+    def _update(self, y, force_refit):
+        started = perf_counter()
+        results, meta = self._load()
+        if results is None:
+            return self._refit(y, None, "no_state", started)
+        if force_refit:
+            return self._refit(y, results, "forced", started)
+
+        # 이미 반영된 관측값이 그대로인지 확인
+        known_index = results.model.data.row_labels
+        known_values = np.asarray(results.model.data.orig_endog, dtype=float).ravel()
+        n_known = len(known_values)
+        if len(y) < n_known or y.index[0] != known_index[0] or \
+                not np.allclose(y.iloc[:n_known].to_numpy(dtype=float), known_values, equal_nan=True):
+            return self._refit(y, results, "history_changed", started)
+
+        new = y.iloc[n_known:]
+        if new.empty:
+            self.last_update = {"mode": "cached", "seconds": round(perf_counter() - started, 3)}
+            return results
+
+        days_since_refit = (datetime.now(KST).date() - date.fromisoformat(meta["last_refit"])).days
+        if days_since_refit >= self.refit_every_days:
+            return self._refit(y, results, "cadence", started)
+
+        # 새 관측을 기존 모델의 다단계 예측과 비교하여 드리프트 판단
+        errors = np.abs(new.to_numpy() - results.forecast(steps=len(new)).to_numpy())
+        scale = meta["resid_std"] or 1.0
+        drift = float(np.nanmax(errors) / scale) if np.isfinite(errors).any() else 0.0
+        if drift > self.drift_threshold:
+            return self._refit(y, results, f"drift({drift:.2f})", started)
+
+        results = results.append(new, refit=False)
+        self._save(results, {"last_refit": meta["last_refit"]})
+        self.last_update = {"mode": "append", "new_obs": int(len(new)), "drift": round(drift, 3),
+                            "seconds": round(perf_counter() - started, 3)}
+        return results
@@ -1,19 +1,35 @@
-from flask import Flask, render_template_string, redirect, url_for
-from apscheduler.schedulers.background import BackgroundScheduler
+from flask import Flask, render_template_string, redirect, url_for, request, jsonify
 import chromedriver_autoinstaller
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException
-from datetime import datetime, timedelta
-from time import sleep
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from datetime import datetime, timedelta, date, time
+from time import perf_counter
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-import pymysql
 import pytz
-import requests
+import threading
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from capstone_common.db import get_raw_connection, pool_metrics
+from capstone_common.rollups import refresh_rollups
+from capstone_common.sites import all_sites, default_site_id, get_site, pvsim_params
+from capstone_common.webjobs import (get_queue, job_result_or_response, jobs_blueprint, process_metrics_list,
+                                     submit_job)
+from backfill import run_backfill
+from driver_pool import DriverPool
+from pvsim_parser import parse_energy_lines, to_frames
+from weather_client import WeatherClient
+from weather_parser import HOURLY_COLUMNS, hourly_rows, parse_weather
 
 app = Flask(__name__)
+app.register_blueprint(jobs_blueprint)
 KST = pytz.timezone("Asia/Seoul")
 chromedriver_autoinstaller.install()
 
@@ -25,189 +41,264 @@ chrome_options.add_argument("--headless")
 chrome_options.add_argument("--no-sandbox")
 chrome_options.add_argument("--disable-dev-shm-usage")
 
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'solar_user',
-    'password': 'solar_pass_2025',
-    'db': 'solar_forecast_muan',
-    'charset': 'utf8mb4',
-    'cursorclass': pymysql.cursors.DictCursor
-}
-API_URL = "https://galaxy.kr-weathernews.com/api_v2/weather_v5.cgi?loc=4684033000&language=ko&5828907"
+KMA_ENERGY_URL = "https://bd.kma.go.kr/kma2020/fs/energySelect2.do?menuCd=F050702000"
+PVSIM_READY_TIMEOUT = 20     # 결과 표 대기 최대 시간(초)
+PVSIM_POLL_INTERVAL = 0.2    # 결과 표 확인 주기(초)
+BACKFILL_CRAWL_TIME = time(23, 59)  # 과거 날짜 조회 시 하루 전체 실측이 포함되도록 마지막 시각 기준
+
+# WebDriver 풀 설정: 최대 브라우저 수, 세션당 최대 사용 횟수, 유휴 종료 시간(초)
+DRIVER_POOL_SIZE = 2
+DRIVER_MAX_USES = 50
+DRIVER_IDLE_TIMEOUT = 600
+
+# 사이트별 좌표·설비용량·지역 코드는 capstone_common/sites.json에서 관리
+API_URL = "https://galaxy.kr-weathernews.com/api_v2/weather_v5.cgi?loc={weather_loc}&language=ko&5828907"
+
+# 날씨 API 캐시: 같은 지역 예보는 TTL(초) 동안 재사용 (/weather 조회 → 저장, 작업자 프로세스 간에는 디스크 캐시로 공유)
+WEATHER_CACHE_TTL = 600
+WEATHER_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "weather")
+WEATHER_CLIENT = WeatherClient(ttl=WEATHER_CACHE_TTL, cache_dir=WEATHER_CACHE_DIR)
 
 # -------------------------------
 # 기상청 API 기반 날씨 수집 및 저장
 # -------------------------------
-def fetch_weather_preview():
-    res = requests.get(API_URL)
-    res.raise_for_status()
-    data = res.json()[0]
-    current_wind_raw = data.get("detailinfo", {}).get("wspd", {}).get("value", "-")
+# 응답을 한 번만 파싱: (일별 행, 시간별 배열)
+def fetch_weather(site_id=None):
+    data = WEATHER_CLIENT.get_json(API_URL.format(weather_loc=get_site(site_id)["weather_loc"]))[0]
+    return parse_weather(data)
+
+def fetch_weather_preview(site_id=None):
+    return fetch_weather(site_id)[0]
+
+# 시간별 날씨 예보: (site_id, forecast_at) 기준 다중 행 upsert (최신 발표로 갱신)
+UPSERT_HOURLY_WEATHER_SQL = f"""
+    INSERT INTO hourly_weather_forecast (site_id, forecast_at, {", ".join(HOURLY_COLUMNS)}, issued_at)
+    VALUES (%s, %s, {", ".join(["%s"] * len(HOURLY_COLUMNS))}, %s)
+    ON DUPLICATE KEY UPDATE
+        {", ".join(f"{column} = VALUES({column})" for column in HOURLY_COLUMNS)},
+        issued_at = VALUES(issued_at)
+"""
+
+UPSERT_DAILY_WEATHER_SQL = """
+    INSERT INTO daily_weather_forecast (
+        forecast_date, location,
+        forecast_temperature_am_c, forecast_temperature_pm_c,
+        forecast_precip_prob_am, forecast_precip_prob_pm,
+        forecast_temperature_min_c, forecast_temperature_max_c, forecast_precip_prob,
+        forecast_sky_am, forecast_sky_pm
+    ) VALUES (
+        %(date)s, %(location)s,
+        %(am_temp)s, %(pm_temp)s,
+        %(am_rain)s, %(pm_rain)s,
+        %(am_temp)s, %(pm_temp)s, %(rain)s,
+        %(am_sky)s, %(pm_sky)s
+    )
+    ON DUPLICATE KEY UPDATE
+        forecast_temperature_am_c = VALUES(forecast_temperature_am_c),
+        forecast_temperature_pm_c = VALUES(forecast_temperature_pm_c),
+        forecast_precip_prob_am = VALUES(forecast_precip_prob_am),
+        forecast_precip_prob_pm = VALUES(forecast_precip_prob_pm),
+        forecast_temperature_min_c = VALUES(forecast_temperature_min_c),
+        forecast_temperature_max_c = VALUES(forecast_temperature_max_c),
+        forecast_precip_prob = VALUES(forecast_precip_prob),
+        forecast_sky_am = VALUES(forecast_sky_am),
+        forecast_sky_pm = VALUES(forecast_sky_pm)
+"""
+
+# 일별 요약(행별 upsert) + 시간별 예보(다중 행 upsert 한 번) 저장 (commit은 호출한 쪽에서)
+# 반환: (일별 삽입 수, 일별 갱신 수, 시간별 행 수)
+def upsert_weather(cursor, site, rows, hourly):
+    inserted, updated = 0, 0
+    for row in rows:
+        try:
+            cursor.execute(UPSERT_DAILY_WEATHER_SQL, dict(row, location=site["location"]))
+            if cursor.rowcount == 1:
+                inserted += 1
+            elif cursor.rowcount == 2:
+                updated += 1
+        except Exception as e:
+            print("❌ 날씨 INSERT 실패:", e)
+            print("🔍 실패한 행:", row)
+
+    issued_at = datetime.now(KST).replace(tzinfo=None, microsecond=0)
+    hourly_saved = len(hourly["at"])
+    if hourly_saved:
+        cursor.executemany(UPSERT_HOURLY_WEATHER_SQL, hourly_rows(site["id"], hourly, issued_at))
+    return inserted, updated, hourly_saved
+
+# 실패 시 예외를 다시 던짐 (작업 큐가 실패로 기록하고 재시도하도록)
+def insert_weather_data(site_id=None):
+    site = get_site(site_id)
     try:
-        current_wind = f"{float(current_wind_raw):.1f}"
-    except:
-        current_wind = "-"
-
-    results = []
-    for entry in data.get("daily", [])[:7]:
-        date_key = entry["TimeLocal"].split("T")[0]
-        wind_list = [float(h["wspd"]) for h in data.get("hourly", []) if h["TimeLocal"].startswith(date_key)]
-        avg_wind = f"{sum(wind_list)/len(wind_list):.1f}" if wind_list else current_wind
-        results.append({
-            "date": date_key,
-            "am_temp": entry["mint"],
-            "pm_temp": entry["maxt"],
-            "am_rain": entry["pop"],
-            "pm_rain": entry["pop"],
-            "am_wind": avg_wind,
-            "pm_wind": avg_wind,
-            "am_sky": entry["day_cmt"],
-            "pm_sky": entry["night_cmt"]
-        })
-    return results
-
-def insert_weather_data():
-    try:
-        rows = fetch_weather_preview()
+        rows, hourly = fetch_weather(site["id"])
         print("📦 저장 시도 대상 (날씨 예보):")
         for row in rows:
             print(row)
     except Exception as e:
         print("❌ 날씨 데이터 fetch 실패:", e)
-        return
+        raise
 
-    conn = pymysql.connect(**DB_CONFIG)
+    conn = get_raw_connection()
     try:
         with conn.cursor() as cursor:
-            inserted, updated = 0, 0
-            for row in rows:
-                try:
-                    cursor.execute("""
-                        INSERT INTO daily_weather_forecast (
-                            forecast_date, location,
-                            forecast_temperature_am_c, forecast_temperature_pm_c,
-                            forecast_precip_prob_am, forecast_precip_prob_pm,
-                            forecast_temperature_min_c, forecast_temperature_max_c, forecast_precip_prob,
-                            forecast_sky_am, forecast_sky_pm
-                        ) VALUES (
-                            %(date)s, '전남 무안군 청계면',
-                            %(am_temp)s, %(pm_temp)s,
-                            %(am_rain)s, %(pm_rain)s,
-                            %(am_temp)s, %(pm_temp)s, %(am_rain)s,
-                            %(am_sky)s, %(pm_sky)s
-                        )
-                        ON DUPLICATE KEY UPDATE
-                            forecast_temperature_am_c = VALUES(forecast_temperature_am_c),
-                            forecast_temperature_pm_c = VALUES(forecast_temperature_pm_c),
-                            forecast_precip_prob_am = VALUES(forecast_precip_prob_am),
-                            forecast_precip_prob_pm = VALUES(forecast_precip_prob_pm),
-                            forecast_temperature_min_c = VALUES(forecast_temperature_min_c),
-                            forecast_temperature_max_c = VALUES(forecast_temperature_max_c),
-                            forecast_precip_prob = VALUES(forecast_precip_prob),
-                            forecast_sky_am = VALUES(forecast_sky_am),
-                            forecast_sky_pm = VALUES(forecast_sky_pm)
-                    """, row)
-                    if cursor.rowcount == 1:
-                        inserted += 1
-                    elif cursor.rowcount == 2:
-                        updated += 1
-                except Exception as e:
-                    print("❌ 날씨 INSERT 실패:", e)
-                    print("🔍 실패한 행:", row)
+            inserted, updated, hourly_saved = upsert_weather(cursor, site, rows, hourly)
         conn.commit()
-        print(f"✅ 날씨 저장 완료: {inserted}개 삽입, {updated}개 갱신")
+        print(f"✅ 날씨 저장 완료 ({site['id']}): {inserted}개 삽입, {updated}개 갱신, 시간별 {hourly_saved}개")
+        return inserted, updated, hourly_saved
     except Exception as e:
+        conn.rollback()
         print("❌ 날씨 DB 저장 중 오류:", e)
+        raise
     finally:
         conn.close()
 
 # -------------------------------
 # 발전 실측 크롤링 및 저장
 # -------------------------------
-def parse_or_zero(val):
-    try:
-        return float(val) if val != '-' else 0.0
-    except:
-        return 0.0
+# Chrome 세션 풀: 크롤링마다 브라우저를 새로 띄우지 않고 재사용
+def create_driver():
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.implicitly_wait(2)
+    return driver
 
-def download_pvsim(now=None):
+DRIVER_POOL = DriverPool(create_driver, max_size=DRIVER_POOL_SIZE,
+                         max_uses=DRIVER_MAX_USES, idle_timeout=DRIVER_IDLE_TIMEOUT)
+
+# 입력 폼 재설정 (이미 로드된 페이지에서도 값이 누적되지 않도록 비운 뒤 입력)
+def fill_pvsim_form(driver, now, site):
+    driver.execute_script(f"document.getElementById('testYmd').value = '{now.strftime('%Y%m%d')}';")
+    driver.execute_script(f"document.getElementById('testTime').value = '{now.strftime('%H%M')}';")
+    for field_id, value in (("txtLat", site['lat']), ("txtLon", site['lon']), ("install_cap", site['cap'])):
+        field = driver.find_element(By.ID, field_id)
+        field.clear()
+        field.send_keys(value)
+
+# 결과 표 준비 여부 판단: 헤더(12줄) 이후 첫 데이터 행이 채워지면 전체 라인을 반환
+def pvsim_table_ready(driver):
+    lines = driver.find_element(By.ID, 'toEnergy').text.strip().split('\n')
+    data_lines = lines[12:]
+    if data_lines and len(data_lines[0].strip()) > 10:
+        return lines
+    return False
+
+# 크롤링별 소요 시간 기록: 페이지/폼 준비, 기상청 응답 대기, 파싱 시간을 분리하여 저장
+CRAWL_METRICS = deque(maxlen=200)
+
+def record_crawl_metrics(now, started, submitted, ready, parsed, line_count, timed_out=False):
+    metrics = {
+        "target": now.strftime('%Y-%m-%d %H:%M'),
+        "recorded_at": datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S'),
+        "prepare_s": round(submitted - started, 3),
+        "wait_s": round(ready - submitted, 3),
+        "parse_s": round(parsed - ready, 3) if parsed is not None else None,
+        "total_s": round((parsed if parsed is not None else ready) - started, 3),
+        "lines": line_count,
+        "timed_out": timed_out
+    }
+    CRAWL_METRICS.append(metrics)
+    print(f"⏱ 크롤링 소요: 준비 {metrics['prepare_s']}s, 대기 {metrics['wait_s']}s, 파싱 {metrics['parse_s']}s")
+    return metrics
+
+# 이 프로세스의 크롤링 · 날씨 캐시 지표 (작업 큐 작업자가 작업 큐에 기록 → /metrics/crawl, /metrics/weather)
+def process_metrics():
+    return {"crawl": list(CRAWL_METRICS), "weather": WEATHER_CLIENT.metrics()}
+
+# 브라우저로 폼을 입력하고 toEnergy 표 텍스트를 읽음
+def fetch_pvsim_lines(now, site, pool, ready_timeout, started):
+    # 예외 발생 시 세션은 풀에서 폐기되고 다음 요청에서 새 브라우저로 교체됨
+    with pool.session() as session:
+        driver = session.driver
+        if session.page_ready:
+            # 재사용 세션: 이전 결과만 지우고 폼 재설정 후 재조회
+            driver.execute_script("document.getElementById('toEnergy').innerHTML = '';")
+        else:
+            driver.get(KMA_ENERGY_URL)
+            session.page_ready = True
+        fill_pvsim_form(driver, now, site)
+        driver.find_element(By.ID, "search_btn").send_keys(Keys.RETURN)
+
+        submitted = perf_counter()
+
+        # 표가 채워지는 즉시 반환 (한 번 읽은 텍스트를 그대로 파싱에 사용)
+        try:
+            lines = WebDriverWait(driver, ready_timeout, poll_frequency=PVSIM_POLL_INTERVAL,
+                                  ignored_exceptions=(StaleElementReferenceException,)).until(pvsim_table_ready)
+        except TimeoutException:
+            record_crawl_metrics(now, started, submitted, perf_counter(), None, 0, timed_out=True)
+            raise TimeoutException(f"데이터 수신 실패: {ready_timeout}초 동안 유효한 데이터 미도달")
+    return lines, submitted
+
+def download_pvsim(now=None, site=None, pool=None, ready_timeout=PVSIM_READY_TIMEOUT):
     if now is None:
         now = datetime.now(KST)
+    site = site or pvsim_params(get_site())
+    pool = pool or DRIVER_POOL
 
     print("📦 크롤링 시각 기준 now:", now.strftime('%Y-%m-%d %H:%M'))
+    started = perf_counter()
 
-    driver = webdriver.Chrome(options=chrome_options)
-    driver.implicitly_wait(2)
-    driver.get("https://bd.kma.go.kr/kma2020/fs/energySelect2.do?menuCd=F050702000")
-    driver.execute_script(f"document.getElementById('testYmd').value = '{now.strftime('%Y%m%d')}';")
-    driver.execute_script(f"document.getElementById('testTime').value = '{now.strftime('%H%M')}';")
-    driver.find_element(By.ID, "txtLat").send_keys('34.910')
-    driver.find_element(By.ID, "txtLon").send_keys('126.435')
-    driver.find_element(By.ID, "install_cap").clear()
-    driver.find_element(By.ID, "install_cap").send_keys('500')
-    driver.find_element(By.ID, "search_btn").send_keys(Keys.RETURN)
-
-    element = driver.find_element(By.ID, 'toEnergy')
-    for i in range(20):
-        lines = element.text.strip().split('\n')[12:]
-        if lines and len(lines[0].strip()) > 10:
-            break
-        sleep(1)
-    else:
-        driver.quit()
-        raise TimeoutException("데이터 수신 실패: 20초 동안 유효한 데이터 미도달")
+    lines, submitted = fetch_pvsim_lines(now, site, pool, ready_timeout, started)
+    ready = perf_counter()
 
     print(f"📊 수신된 데이터 라인 수: {len(lines)}")
 
-    lines = element.text.strip().split('\n')
-    today_data, tomorrow_data = [], []
-    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    tomorrow = today + timedelta(days=1)
-
-    for line in lines:
-        parts = line.split()
-        if len(parts) < 11:
-            continue
-        hour = parts[0][:-1].zfill(2)
-        today_time = today + timedelta(hours=int(hour))
-        tomorrow_time = tomorrow + timedelta(hours=int(hour))
-
-        today_data.append([
-            today_time.strftime("%Y-%m-%d %H:%M"),
-            parse_or_zero(parts[1]),
-            parse_or_zero(parts[2]),
-            parse_or_zero(parts[3]),
-            parse_or_zero(parts[4]),
-            parse_or_zero(parts[5]),
-            0.0, 0.0, 0.0
-        ])
-        tomorrow_data.append([
-            tomorrow_time.strftime("%Y-%m-%d %H:%M"),
-            0.0, 0.0, 0.0, 0.0, 0.0,
-            parse_or_zero(parts[8]),
-            parse_or_zero(parts[9]),
-            parse_or_zero(parts[10])
-        ])
-
-    columns = [
-        "datetime", "powergen", "cumulative", "irradiance", "temperature", "wind",
-        "fcst_irradiance", "fcst_temperature", "fcst_wind"
-    ]
-    df_today = pd.DataFrame(today_data, columns=columns)
-    df_tomorrow = pd.DataFrame(tomorrow_data, columns=columns)
-    driver.quit()
+    df_today, df_tomorrow = to_frames(parse_energy_lines(lines, now))
+
+    record_crawl_metrics(now, started, submitted, ready, perf_counter(), len(lines))
 
     print("✅ 수집된 시간 범위:")
     print("오늘:", df_today['datetime'].iloc[0], "~", df_today['datetime'].iloc[-1])
     print("내일:", df_tomorrow['datetime'].iloc[0], "~", df_tomorrow['datetime'].iloc[-1])
 
-    return df_today.fillna(0.0).reset_index(drop=True), df_tomorrow.fillna(0.0).reset_index(drop=True)
+    return df_today, df_tomorrow
+
+# 크롤링 DataFrame 컬럼 → measurement 컬럼 매핑 (measured_at 제외)
+MEASUREMENT_SOURCE_COLUMNS = [
+    'powergen', 'cumulative',
+    'irradiance', 'temperature', 'wind',
+    'fcst_irradiance', 'fcst_temperature', 'fcst_wind'
+]
+BULK_CHUNK_SIZE = 500
+
+# 실측 프레임 upsert: 기존 행은 실측 열만 갱신 (실측 프레임의 예보 열은 0.0 자리값이므로
+# 전날 내일 예보로 저장한 예보 열을 덮어쓰지 않음, 새 행에만 그대로 삽입)
+UPSERT_MEASUREMENT_SQL = """
+    INSERT INTO measurement (
+        site_id, measured_at, power_mw, cumulative_mwh,
+        irradiance_wm2, temperature_c, wind_speed_ms,
+        forecast_irradiance_wm2, forecast_temperature_c, forecast_wind_speed_ms
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        power_mw = VALUES(power_mw),
+        cumulative_mwh = VALUES(cumulative_mwh),
+        irradiance_wm2 = VALUES(irradiance_wm2),
+        temperature_c = VALUES(temperature_c),
+        wind_speed_ms = VALUES(wind_speed_ms)
+"""
+
+# 과거 날짜 범위 일괄 수집: 워커 수만큼의 전용 브라우저 풀을 사용하고 결과는 벌크 저장
+def backfill_pvsim(start, end, site_id=None, workers=2, retries=3, status=None):
+    site_id = site_id or default_site_id()
+    site = pvsim_params(get_site(site_id))
+    pool = DriverPool(create_driver, max_size=workers, max_uses=DRIVER_MAX_USES, idle_timeout=DRIVER_IDLE_TIMEOUT)
+
+    def crawl(day, site):
+        now = KST.localize(datetime.combine(day, BACKFILL_CRAWL_TIME))
+        return download_pvsim(now, site=site, pool=pool)[0]
 
-def save_to_db(df):
-    conn = pymysql.connect(**DB_CONFIG)
+    try:
+        return run_backfill(crawl, lambda df: save_to_db_bulk(df, site_id=site_id), start, end, site,
+                            workers=workers, retries=retries, status=status)
+    finally:
+        pool.close()
+
+def save_to_db(df, site_id=None):
+    site_id = site_id or default_site_id()
+    conn = get_raw_connection()
+    inserted, updated, skipped = 0, 0, 0
+    saved_at = []
     try:
         with conn.cursor() as cursor:
-            inserted, updated, skipped = 0, 0, 0
             for _, row in df.iterrows():
                 try:
                     # 유효성 검사: 측정값이 모두 0이면 저장하지 않음
@@ -217,7 +308,8 @@ def save_to_db(df):
                         continue
 
                     data = {
-                        'measured_at': datetime.strptime(row['datetime'], '%Y-%m-%d %H:%M'),
+                        'site_id': site_id,
+                        'measured_at': pd.Timestamp(row['datetime']).to_pydatetime(),
                         'power_mw': row['powergen'],
                         'cumulative_mwh': row['cumulative'],
                         'irradiance_wm2': row['irradiance'],
@@ -230,11 +322,11 @@ def save_to_db(df):
 
                     sql = """
                         INSERT INTO measurement (
-                            measured_at, power_mw, cumulative_mwh,
+                            site_id, measured_at, power_mw, cumulative_mwh,
                             irradiance_wm2, temperature_c, wind_speed_ms,
                             forecast_irradiance_wm2, forecast_temperature_c, forecast_wind_speed_ms
                         ) VALUES (
-                            %(measured_at)s, %(power_mw)s, %(cumulative_mwh)s,
+                            %(site_id)s, %(measured_at)s, %(power_mw)s, %(cumulative_mwh)s,
                             %(irradiance_wm2)s, %(temperature_c)s, %(wind_speed_ms)s,
                             %(forecast_irradiance_wm2)s, %(forecast_temperature_c)s, %(forecast_wind_speed_ms)s
                         )
@@ -243,30 +335,219 @@ def save_to_db(df):
                             cumulative_mwh = VALUES(cumulative_mwh),
                             irradiance_wm2 = VALUES(irradiance_wm2),
                             temperature_c = VALUES(temperature_c),
-                            wind_speed_ms = VALUES(wind_speed_ms),
-                            forecast_irradiance_wm2 = VALUES(forecast_irradiance_wm2),
-                            forecast_temperature_c = VALUES(forecast_temperature_c),
-                            forecast_wind_speed_ms = VALUES(forecast_wind_speed_ms)
+                            wind_speed_ms = VALUES(wind_speed_ms)
                     """
                     affected = cursor.execute(sql, data)
                     if affected == 1:
                         inserted += 1
                     elif affected == 2:
                         updated += 1
+                    saved_at.append(data['measured_at'])
                 except Exception as e:
                     print("❌ INSERT 실패:", e)
                     print("🔍 문제 발생 데이터:", row.to_dict())
+            # 저장한 날짜의 일별/월별 집계를 같은 트랜잭션에서 갱신
+            refresh_rollups(cursor, site_id, saved_at)
         conn.commit()
         print(f"✅ 저장 완료: {inserted}개 삽입, {updated}개 갱신, {skipped}개 스킵")
     except Exception as e:
         print("❌ DB 저장 중 예외 발생:", e)
     finally:
         conn.close()
+    return inserted, updated, skipped
+
+# 벌크 저장용 행 변환: 유효성 검사와 형 변환을 DataFrame 단위로 한 번에 수행
+# (파서가 만든 datetime64 열은 그대로 사용하고, 문자열 시각만 변환)
+def prepare_measurement_rows(df, site_id):
+    measured_at = df['datetime']
+    if not pd.api.types.is_datetime64_any_dtype(measured_at):
+        measured_at = pd.to_datetime(measured_at, format='%Y-%m-%d %H:%M', errors='coerce')
+    values = df[MEASUREMENT_SOURCE_COLUMNS].apply(pd.to_numeric, errors='coerce')
+
+    # 유효성 검사: 측정값이 모두 0(또는 결측)이거나 시각 파싱 실패 시 저장하지 않음
+    invalid = values[['powergen', 'irradiance', 'temperature']].fillna(0.0).eq(0.0).all(axis=1)
+    invalid |= measured_at.isna()
+
+    # 같은 시각이 중복되면 마지막 값만 사용 (행별 저장 시 마지막 값이 남는 것과 동일)
+    duplicated = measured_at.duplicated(keep='last') & ~invalid
+    keep = ~(invalid | duplicated)
+
+    frame = values[keep].astype(object).where(values[keep].notna(), None)
+    frame.insert(0, 'measured_at', measured_at[keep].dt.to_pydatetime())
+    frame.insert(0, 'site_id', site_id)
+    rows = list(frame.itertuples(index=False, name=None))
+    return rows, int((~keep).sum())
+
+# 청크 단위 다중 행 upsert (commit은 호출한 쪽에서), 반환: (삽입 수, 갱신 수)
+def upsert_measurement_rows(cursor, rows, site_id, chunk_size=BULK_CHUNK_SIZE):
+    inserted, updated = 0, 0
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        keys = [row[1] for row in chunk]
+
+        # 정확한 삽입/갱신 수 계산을 위해 기존 행 수를 먼저 조회
+        placeholders = ", ".join(["%s"] * len(keys))
+        existing = cursor.execute(
+            f"SELECT measured_at FROM measurement WHERE site_id = %s AND measured_at IN ({placeholders})",
+            [site_id] + keys
+        )
+
+        # pymysql은 INSERT ... VALUES 구문의 executemany를 다중 VALUES 한 문장으로 묶어 전송
+        # 영향 행 수 = 신규 행 1 + 값이 바뀐 기존 행 2 (값이 같은 기존 행은 0)
+        affected = cursor.executemany(UPSERT_MEASUREMENT_SQL, chunk)
+        chunk_inserted = len(chunk) - existing
+        inserted += chunk_inserted
+        updated += (affected - chunk_inserted) // 2
+    return inserted, updated
+
+# 벌크 저장: 청크 단위 다중 행 upsert를 하나의 트랜잭션으로 처리
+def save_to_db_bulk(df, chunk_size=BULK_CHUNK_SIZE, site_id=None):
+    site_id = site_id or default_site_id()
+    rows, skipped = prepare_measurement_rows(df, site_id)
+    inserted, updated = 0, 0
+    if not rows:
+        print(f"✅ 벌크 저장 완료: 0개 삽입, 0개 갱신, {skipped}개 스킵")
+        return inserted, updated, skipped
+
+    conn = get_raw_connection()
+    try:
+        with conn.cursor() as cursor:
+            inserted, updated = upsert_measurement_rows(cursor, rows, site_id, chunk_size)
+            # 저장한 날짜 구간의 일별/월별 집계를 같은 트랜잭션에서 갱신
+            refresh_rollups(cursor, site_id, [row[1] for row in rows])
+        conn.commit()
+        print(f"✅ 벌크 저장 완료 ({site_id}): {inserted}개 삽입, {updated}개 갱신, {skipped}개 스킵")
+    except Exception as e:
+        conn.rollback()
+        print("❌ 벌크 DB 저장 중 예외 발생 (롤백):", e)
+        raise
+    finally:
+        conn.close()
+    return inserted, updated, skipped
+
+# 사이트 하나의 당일 실측 수집 → 저장 (플릿 스케줄러의 crawl 단계)
+def crawl_site(site_id=None):
+    site = get_site(site_id)
+    df_today, _ = download_pvsim(site=pvsim_params(site))
+    return save_to_db_bulk(df_today, site_id=site["id"])
+
+# /solar 화면용 오늘 · 내일 발전량 예보 표 (작업 큐에서 실행)
+def solar_preview(site_id=None):
+    site = get_site(site_id)
+    df_today, df_tomorrow = download_pvsim(site=pvsim_params(site))
+    df = pd.concat([df_today, df_tomorrow])
+    df['datetime'] = df['datetime'].dt.strftime("%Y-%m-%d %H:%M")
+    return {"now": datetime.now(KST).strftime("%Y-%m-%d %H:%M"), "rows": df.to_dict(orient='records')}
 
+# -------------------------------
+# 통합 수집 주기 (날씨 API + 발전량 크롤링)
+# -------------------------------
+# HTTP 날씨 조회와 브라우저 크롤링을 스레드 두 개로 동시에 실행하고(둘 다 I/O 대기), 결과를 한 트랜잭션으로 저장합니다.
+# - 오늘 프레임: 실측 열만 갱신 (이미 저장된 예보 열을 오늘 프레임의 0으로 덮어쓰지 않음)
+# - 내일 프레임: 예보 열(일사량 · 기온 · 풍속)만 upsert
+# - 단계별 시작 시점(주기 시작 기준)과 소요 시간을 timeline으로 반환 → 주기 시간 ≈ 느린 쪽 수집 + 저장
+# 한쪽 수집이 실패하면 성공한 쪽만 저장한 뒤 예외를 발생시킴 (작업 큐 재시도 시 날씨는 TTL 캐시에서 재사용)
+INGEST_FETCH_STAGES = ("weather_fetch", "pvsim_crawl")
+
+UPSERT_FORECAST_COLUMNS_SQL = """
+    INSERT INTO measurement (site_id, measured_at, forecast_irradiance_wm2, forecast_temperature_c, forecast_wind_speed_ms)
+    VALUES (%s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        forecast_irradiance_wm2 = VALUES(forecast_irradiance_wm2),
+        forecast_temperature_c = VALUES(forecast_temperature_c),
+        forecast_wind_speed_ms = VALUES(forecast_wind_speed_ms)
+"""
+
+# 내일 예보 행 변환: 예보 값이 모두 0(또는 결측)인 시각은 저장하지 않음
+def prepare_forecast_rows(df, site_id):
+    values = df[['fcst_irradiance', 'fcst_temperature', 'fcst_wind']].apply(pd.to_numeric, errors='coerce')
+    keep = ~values.fillna(0.0).eq(0.0).all(axis=1)
+    frame = values[keep].astype(object).where(values[keep].notna(), None)
+    frame.insert(0, 'measured_at', pd.to_datetime(df['datetime'][keep]).dt.to_pydatetime())
+    frame.insert(0, 'site_id', site_id)
+    return list(frame.itertuples(index=False, name=None))
+
+# 오늘 실측 + 내일 예보를 같은 커서로 저장하고 저장한 날짜의 집계 갱신 (commit은 호출한 쪽에서)
+# 예보만 있는 내일도 집계를 갱신하여 updated_at이 바뀌게 함 (measurement 증분 캐시가 내일 예보 행을 다시 읽도록,
+# 실측이 없는 날의 발전량은 집계에서 NULL)
+def upsert_frames(cursor, site_id, df_today, df_tomorrow):
+    rows, skipped = prepare_measurement_rows(df_today, site_id)
+    inserted, updated = upsert_measurement_rows(cursor, rows, site_id)
+    forecast_rows = prepare_forecast_rows(df_tomorrow, site_id)
+    if forecast_rows:
+        cursor.executemany(UPSERT_FORECAST_COLUMNS_SQL, forecast_rows)
+    refresh_rollups(cursor, site_id, [row[1] for row in rows + forecast_rows])
+    return {"inserted": inserted, "updated": updated, "skipped": skipped, "forecast_rows": len(forecast_rows)}
+
+# 단계 실행 기록 (여러 스레드에서 같은 timeline 리스트에 추가)
+def run_stage(timeline, cycle_started, stage, func, *args, **kwargs):
+    started = perf_counter()
+    record = {"stage": stage, "offset": round(started - cycle_started, 3)}
+    try:
+        return func(*args, **kwargs)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record["seconds"] = round(perf_counter() - started, 3)
+        timeline.append(record)
+
+def ingest_site(site_id=None):
+    site = get_site(site_id)
+    timeline = []
+    cycle_started = perf_counter()
+    with ThreadPoolExecutor(max_workers=len(INGEST_FETCH_STAGES)) as executor:
+        futures = {
+            "weather_fetch": executor.submit(run_stage, timeline, cycle_started, "weather_fetch", fetch_weather, site["id"]),
+            "pvsim_crawl": executor.submit(run_stage, timeline, cycle_started, "pvsim_crawl",
+                                           download_pvsim, site=pvsim_params(site))
+        }
+    errors = {stage: f"{type(future.exception()).__name__}: {future.exception()}"
+              for stage, future in futures.items() if future.exception() is not None}
+
+    saved = {}
+    if len(errors) < len(futures):
+        conn = get_raw_connection()
+        try:
+            with conn.cursor() as cursor:
+                if "weather_fetch" not in errors:
+                    counts = run_stage(timeline, cycle_started, "weather_upsert",
+                                       upsert_weather, cursor, site, *futures["weather_fetch"].result())
+                    saved["weather"] = dict(zip(("daily_inserted", "daily_updated", "hourly"), counts))
+                if "pvsim_crawl" not in errors:
+                    saved["measurement"] = run_stage(timeline, cycle_started, "measurement_upsert",
+                                                     upsert_frames, cursor, site["id"], *futures["pvsim_crawl"].result())
+            run_stage(timeline, cycle_started, "commit", conn.commit)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    timeline.sort(key=lambda record: record["offset"])
+    fetches = [record for record in timeline if record["stage"] in INGEST_FETCH_STAGES]
+    report = {
+        "site_id": site["id"],
+        "timeline": timeline,
+        "wall_seconds": round(perf_counter() - cycle_started, 3),
+        "fetch_wall_seconds": round(max(r["offset"] + r["seconds"] for r in fetches), 3),
+        "fetch_serial_seconds": round(sum(r["seconds"] for r in fetches), 3),
+        "saved": saved,
+        "errors": errors
+    }
+    print(f"🧭 수집 주기 ({site['id']}): {report['wall_seconds']:.1f}s "
+          f"(수집 {report['fetch_wall_seconds']:.1f}s, 순차 실행 시 {report['fetch_serial_seconds']:.1f}s)")
+    for record in timeline:
+        print(f"   {record['stage']:<20} +{record['offset']:.2f}s {record['seconds']:.2f}s"
+              + (f" ❌ {record['error']}" if "error" in record else ""))
+    if errors:
+        raise RuntimeError(f"수집 실패 ({', '.join(errors)}): {report}")
+    return report
 
 # -------------------------------
 # Flask 라우팅
 # -------------------------------
+# 크롤링 · 외부 API 호출은 작업 큐에 등록하고 바로 응답 (같은 요청이 대기/실행 중이면 그 작업으로 병합)
 @app.route("/")
 def home():
     return """
@@ -277,27 +558,88 @@ def home():
 
 @app.route("/insert")
 def manual_insert():
+    site_id = get_site(request.args.get("site"))["id"]
+    _, response = job_result_or_response(lambda: submit_job("crawl", {"site_id": site_id})[0],
+                                          'manual_insert', "발전량 저장", site=site_id)
+    return response or redirect(url_for('solar', site=site_id))
+
+# 과거 날짜 일괄 수집은 백그라운드 스레드에서 실행하고 진행 상황은 /backfill/status 로 확인
+BACKFILL_STATUS = {"state": "idle"}
+
+@app.route("/backfill", methods=["POST"])
+def backfill():
+    if BACKFILL_STATUS.get("state") == "running":
+        return jsonify({"status": "error", "message": "이미 실행 중인 backfill이 있습니다."}), 409
     try:
-        df_today, _ = download_pvsim()
-        save_to_db(df_today)
-        return redirect(url_for('solar'))
-    except Exception as e:
-        return f"<h1>🚨 삽입 실패</h1><p>{e}</p>"
+        start = date.fromisoformat(request.values["start"])
+        end = date.fromisoformat(request.values["end"])
+        workers = int(request.values.get("workers", 2))
+    except (KeyError, ValueError) as e:
+        return jsonify({"status": "error", "message": f"잘못된 요청: {e}"}), 400
+    site_id = request.values.get("site", default_site_id())
+    if site_id not in {site["id"] for site in all_sites()}:
+        return jsonify({"status": "error", "message": f"등록되지 않은 사이트: {site_id}"}), 400
+
+    def worker():
+        try:
+            backfill_pvsim(start, end, site_id, workers, status=BACKFILL_STATUS)
+        except Exception as e:
+            BACKFILL_STATUS.update({"state": "error", "message": str(e)})
+
+    BACKFILL_STATUS.clear()
+    BACKFILL_STATUS["state"] = "running"
+    threading.Thread(target=worker, daemon=True).start()
+    return jsonify({"status": "started", "start": start.isoformat(), "end": end.isoformat(), "site": site_id}), 202
+
+@app.route("/backfill/status")
+def backfill_status():
+    return jsonify(BACKFILL_STATUS)
+
+# 크롤링 · 날씨 조회는 작업 큐 작업자 프로세스에서 실행되므로 작업자가 기록한 지표를 함께 표시
+# (이 웹 프로세스의 값은 /backfill 크롤링과 DB 조회분)
+@app.route("/metrics/crawl")
+def crawl_metrics():
+    sources = process_metrics_list("crawl", list(CRAWL_METRICS))
+    rows = sorted((dict(m, worker=source["worker"]) for source in sources for m in source["metrics"]),
+                  key=lambda m: m["recorded_at"])
+    completed = [m for m in rows if not m["timed_out"]]
+    summary = {
+        "count": len(rows),
+        "timeouts": len(rows) - len(completed),
+        "avg_wait_s": round(sum(m["wait_s"] for m in completed) / len(completed), 3) if completed else None,
+        "avg_parse_s": round(sum(m["parse_s"] for m in completed) / len(completed), 3) if completed else None,
+        "workers": {source["worker"]: len(source["metrics"]) for source in sources}
+    }
+    return jsonify({"summary": summary, "recent": rows[-20:]})
+
+@app.route("/metrics/db")
+def db_metrics():
+    return jsonify(process_metrics_list("db", pool_metrics()))
+
+@app.route("/metrics/weather")
+def weather_metrics():
+    return jsonify(process_metrics_list("weather", WEATHER_CLIENT.metrics()))
+
+@app.route("/metrics/ingest")
+def ingest_metrics():
+    # 통합 수집 주기는 작업 큐 작업자에서 실행되므로 최근 완료 작업의 단계별 timeline을 표시
+    return jsonify([dict(job["result"], finished_at=job["finished_at"]) for job in get_queue().recent_done("ingest", limit=10)])
 
 @app.route("/insert-weather")
 def insert_weather():
-    try:
-        insert_weather_data()
-        return redirect(url_for('weather'))
-    except Exception as e:
-        return f"<h1>🌧️ 삽입 실패</h1><p>{e}</p>"
+    site_id = get_site(request.args.get("site"))["id"]
+    _, response = job_result_or_response(lambda: submit_job("weather", {"site_id": site_id})[0],
+                                          'insert_weather', "날씨 예보 저장", site=site_id)
+    return response or redirect(url_for('weather', site=site_id))
 
 @app.route("/weather")
 def weather():
-    try:
-        rows = fetch_weather_preview()
-    except Exception as e:
-        return f"<h1>🌧️ 날씨 수집 실패</h1><p>{e}</p>"
+    site = get_site(request.args.get("site"))
+    result, response = job_result_or_response(lambda: submit_job("weather_preview", {"site_id": site["id"]})[0],
+                                               'weather', "날씨 예보 조회", site=site["id"])
+    if response:
+        return response
+    rows = result["rows"]
 
     template = """
     <html><head><meta charset='utf-8'><title>날씨 예보</title>
@@ -310,8 +652,9 @@ def weather():
         .btn-save:hover { background: #0056b3; }
     </style>
     </head><body>
-        <h2>🌤 무안군 청계면 날씨 예보</h2>
+        <h2>🌤 {{ site.location }} 날씨 예보</h2>
         <form action="/insert-weather" method="get">
+            <input type="hidden" name="site" value="{{ site.id }}">
             <button type="submit" class="btn-save">예보 수동 저장</button>
         </form>
         <table>
@@ -328,15 +671,15 @@ def weather():
         </table>
     </body></html>
     """
-    return render_template_string(template, rows=rows)
+    return render_template_string(template, rows=rows, site=site)
 
 @app.route("/solar")
 def solar():
-    try:
-        df_today, df_tomorrow = download_pvsim()
-        df = pd.concat([df_today, df_tomorrow])
-    except Exception as e:
-        return f"<h1>🚨 발전량 수집 실패</h1><p>{e}</p>"
+    site = get_site(request.args.get("site"))
+    result, response = job_result_or_response(lambda: submit_job("solar_preview", {"site_id": site["id"]})[0],
+                                               'solar', "발전량 예보 수집", site=site["id"])
+    if response:
+        return response
 
     template = """
     <!doctype html>
@@ -354,9 +697,10 @@ def solar():
         </style>
     </head>
     <body>
-        <h1>🔆 무안군 태양광 발전 예보</h1>
+        <h1>🔆 {{ site.name }} 태양광 발전 예보</h1>
         <p>예보 시각: {{ now }}</p>
         <form action="/insert" method="get">
+            <input type="hidden" name="site" value="{{ site.id }}">
             <button type="submit" class="btn-insert">발전량 수동 저장</button>
         </form>
         <table>
@@ -383,15 +727,12 @@ def solar():
         </table>
     </body></html>
     """
-    return render_template_string(template, rows=df.to_dict(orient='records'), now=datetime.now(KST).strftime("%Y-%m-%d %H:%M"))
+    return render_template_string(template, rows=result["rows"], site=site, now=result["now"])
 
 # -------------------------------
-# 스케줄러 실행
+# 서버 실행
 # -------------------------------
-scheduler = BackgroundScheduler()
-scheduler.add_job(insert_weather_data, 'cron', hour=7, minute=0)
-scheduler.add_job(lambda: save_to_db(download_pvsim()[0]), 'cron', hour=7, minute=5)
-scheduler.start()
-
+# 정기 수집(날씨 07:00, 발전량 07:05)과 브라우저 워밍업 · 유휴 브라우저 정리는 작업 큐(python -m capstone_common.jobqueue worker)
+# 작업자 프로세스에서 수행 (/backfill은 실행할 때마다 별도 풀을 만들고 끝나면 종료)
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000)
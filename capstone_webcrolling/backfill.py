@@ -0,0 +1,100 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from time import perf_counter, sleep
+
+# -------------------------------
+# 과거 발전량 일괄 수집 (backfill)
+# -------------------------------
+# 날짜 범위를 제한된 수의 워커(브라우저)에 나눠 병렬로 크롤링하고,
+# 완료된 날짜는 체크포인트 파일에 기록하여 중단 후 재실행 시 이어서 수집합니다.
+# 크롤링 결과는 완료되는 순서대로 바로 DB 저장 함수로 전달됩니다.
+
+CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "checkpoints")
+
+def date_range(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+def checkpoint_path_for(site):
+    name = f"backfill_{site['lat']}_{site['lon']}_{site['cap']}.json"
+    return os.path.join(CHECKPOINT_DIR, name)
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return set(json.load(f).get("completed", []))
+
+# 임시 파일에 쓴 뒤 교체하여 중간에 종료되어도 체크포인트가 깨지지 않도록 함
+def save_checkpoint(path, completed):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"completed": sorted(completed)}, f)
+    os.replace(tmp_path, path)
+
+# 실패 시 지수 백오프로 재시도 (backoff, backoff*2, backoff*4 ...초 대기)
+def crawl_with_retry(crawl, day, site, retries=3, backoff=5.0):
+    for attempt in range(1, retries + 1):
+        try:
+            return crawl(day, site)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** (attempt - 1)
+            print(f"⚠️ {day} 크롤링 실패 ({attempt}/{retries}), {delay:.0f}초 후 재시도: {e}")
+            sleep(delay)
+
+def run_backfill(crawl, save, start, end, site, workers=2, retries=3, backoff=5.0,
+                 checkpoint_path=None, status=None):
+    checkpoint_path = checkpoint_path or checkpoint_path_for(site)
+    completed = load_checkpoint(checkpoint_path)
+    days = [d for d in date_range(start, end) if d.isoformat() not in completed]
+    status = status if status is not None else {}
+    status.update({
+        "state": "running", "start": start.isoformat(), "end": end.isoformat(),
+        "total": len(days), "done": 0, "failed": [], "days_per_minute": 0.0
+    })
+    print(f"📦 backfill 대상: {len(days)}일 (체크포인트로 {len(date_range(start, end)) - len(days)}일 건너뜀)")
+
+    started = perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(crawl_with_retry, crawl, d, site, retries, backoff): d for d in days}
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                df = future.result()
+                save(df)
+            except Exception as e:
+                print(f"❌ {day} 수집 최종 실패: {e}")
+                status["failed"].append(day.isoformat())
+                continue
+
+            completed.add(day.isoformat())
+            save_checkpoint(checkpoint_path, completed)
+            status["done"] += 1
+            elapsed_min = (perf_counter() - started) / 60
+            status["days_per_minute"] = round(status["done"] / elapsed_min, 2) if elapsed_min > 0 else 0.0
+            print(f"✅ {day} 저장 ({status['done']}/{status['total']}, {status['days_per_minute']}일/분)")
+
+    status["state"] = "finished"
+    status["elapsed_seconds"] = round(perf_counter() - started, 1)
+    print(f"🏁 backfill 종료: {status['done']}일 성공, {len(status['failed'])}일 실패, "
+          f"{status['days_per_minute']}일/분")
+    return status
+
+
+if __name__ == "__main__":
+    from app import backfill_pvsim
+
+    parser = argparse.ArgumentParser(description="과거 날짜 범위 발전량 일괄 수집")
+    parser.add_argument("start", type=date.fromisoformat, help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("end", type=date.fromisoformat, help="종료일 (YYYY-MM-DD)")
+    parser.add_argument("--site", default=None, help="사이트 키 (capstone_common/sites.json, 기본: default 사이트)")
+    parser.add_argument("--workers", type=int, default=2, help="동시에 사용할 브라우저 수")
+    parser.add_argument("--retries", type=int, default=3)
+    args = parser.parse_args()
+
+    backfill_pvsim(args.start, args.end, args.site, workers=args.workers, retries=args.retries)
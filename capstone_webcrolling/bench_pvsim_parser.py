@@ -0,0 +1,70 @@
+# -------------------------------
+# toEnergy 표 파서 검증 및 성능 비교 (기존 행별 파싱 vs pvsim_parser)
+# 사용법: python bench_pvsim_parser.py [반복 횟수]
+# fixtures/pvsim_toEnergy.txt로 두 방식의 결과가 같은지 확인한 뒤 소요 시간을 비교합니다.
+# (실제 화면 캡처가 아닌 합성 표: toEnergy 표의 줄 형식을 따르고, 누적 열은 발전량의 누적 합으로 맞춤)
+# -------------------------------
+import os
+import sys
+from datetime import datetime, timedelta
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from pvsim_parser import FRAME_COLUMNS, parse_energy_text, to_frames
+
+SNAPSHOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pvsim_toEnergy.txt")
+
+def parse_or_zero(val):
+    try:
+        return float(val) if val != '-' else 0.0
+    except:
+        return 0.0
+
+# 기존 download_pvsim 내부의 행별 파싱 (비교 기준)
+def legacy_parse(text, now):
+    today_data, tomorrow_data = [], []
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow = today + timedelta(days=1)
+    for line in text.strip().split('\n'):
+        parts = line.split()
+        if len(parts) < 11:
+            continue
+        hour = parts[0][:-1].zfill(2)
+        today_time = today + timedelta(hours=int(hour))
+        tomorrow_time = tomorrow + timedelta(hours=int(hour))
+        today_data.append([today_time.strftime("%Y-%m-%d %H:%M")] + [parse_or_zero(p) for p in parts[1:6]] + [0.0] * 3)
+        tomorrow_data.append([tomorrow_time.strftime("%Y-%m-%d %H:%M")] + [0.0] * 5 + [parse_or_zero(p) for p in parts[8:11]])
+    df_today = pd.DataFrame(today_data, columns=FRAME_COLUMNS)
+    df_tomorrow = pd.DataFrame(tomorrow_data, columns=FRAME_COLUMNS)
+    # 저장 단계에서 다시 수행하던 문자열 → 시각 변환까지 포함
+    for df in (df_today, df_tomorrow):
+        df['datetime'] = df['datetime'].map(lambda v: datetime.strptime(v, '%Y-%m-%d %H:%M'))
+    return df_today, df_tomorrow
+
+def vectorized_parse(text, now):
+    return to_frames(parse_energy_text(text, now))
+
+def timeit(func, text, now, repeat):
+    started = perf_counter()
+    for _ in range(repeat):
+        func(text, now)
+    return (perf_counter() - started) / repeat
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with open(SNAPSHOT, encoding="utf-8") as f:
+        text = f.read()
+    now = datetime(2025, 4, 1, 14, 30)
+
+    for legacy, vectorized in zip(legacy_parse(text, now), vectorized_parse(text, now)):
+        assert len(legacy) == len(vectorized) == 24
+        assert (legacy['datetime'].to_numpy(dtype='datetime64[ns]') == vectorized['datetime'].to_numpy()).all()
+        assert np.allclose(legacy[FRAME_COLUMNS[1:]].to_numpy(), vectorized[FRAME_COLUMNS[1:]].to_numpy())
+    print("✅ 합성 표 파싱 결과 일치 (오늘/내일 각 24행)")
+
+    legacy_s = timeit(legacy_parse, text, now, repeat)
+    vectorized_s = timeit(vectorized_parse, text, now, repeat)
+    print(f"⏱ 기존 행별 파싱: {legacy_s * 1000:.3f}ms/회")
+    print(f"⏱ 벡터화 파싱  : {vectorized_s * 1000:.3f}ms/회 ({legacy_s / vectorized_s:.1f}배)")
@@ -0,0 +1,58 @@
+# -------------------------------
+# save_to_db (행별) vs save_to_db_bulk (벌크) 저장 성능 비교
+# 사용법: python bench_save_to_db.py [연도]
+# 합성 1년치 시간별 데이터를 지정 연도(기본 2000년)에 기록한 뒤 삭제합니다.
+# -------------------------------
+import sys
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from app import save_to_db, save_to_db_bulk
+from capstone_common.db import raw_connection
+
+def make_synthetic_year(year):
+    index = pd.date_range(f"{year}-01-01", f"{year}-12-31 23:00", freq="h")
+    rng = np.random.default_rng(0)
+    hour = index.hour.to_numpy()
+    daylight = np.clip(np.sin((hour - 6) / 14 * np.pi), 0, None)
+    powergen = np.round(daylight * rng.uniform(200, 500, len(index)), 1)
+    return pd.DataFrame({
+        "datetime": index.strftime("%Y-%m-%d %H:%M"),
+        "powergen": powergen,
+        "cumulative": np.round(pd.Series(powergen).groupby(index.date).cumsum().to_numpy(), 1),
+        "irradiance": np.round(daylight * rng.uniform(300, 900, len(index)), 1),
+        "temperature": np.round(rng.uniform(-5, 32, len(index)), 1),
+        "wind": np.round(rng.uniform(0, 8, len(index)), 1),
+        "fcst_irradiance": 0.0,
+        "fcst_temperature": 0.0,
+        "fcst_wind": 0.0
+    })
+
+def clear_year(year):
+    with raw_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM measurement WHERE YEAR(measured_at) = %s", (year,))
+            cursor.execute("DELETE FROM measurement_daily WHERE YEAR(day) = %s", (year,))
+            cursor.execute("DELETE FROM measurement_monthly WHERE YEAR(month) = %s", (year,))
+        conn.commit()
+
+def run(label, save, df, year):
+    clear_year(year)
+    started = perf_counter()
+    counts = save(df)
+    elapsed = perf_counter() - started
+    print(f"⏱ {label}: {elapsed:.2f}s ({len(df) / elapsed:,.0f} rows/s) → 삽입/갱신/스킵 {counts}")
+    return elapsed, counts
+
+if __name__ == "__main__":
+    year = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    df = make_synthetic_year(year)
+    print(f"📦 합성 데이터: {len(df)}행 ({year}년)")
+    try:
+        row_time, row_counts = run("행별 저장", save_to_db, df, year)
+        bulk_time, bulk_counts = run("벌크 저장", save_to_db_bulk, df, year)
+        print(f"🚀 속도 향상: {row_time / bulk_time:.1f}배, 결과 일치: {row_counts == bulk_counts}")
+    finally:
+        clear_year(year)
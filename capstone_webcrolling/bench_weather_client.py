@@ -0,0 +1,98 @@
+# 날씨 API 클라이언트(weather_client.py) 캐시 동작 검증 및 지연 시간 비교
+# 사용법: python bench_weather_client.py [동시 요청 수]
+# 네트워크 없이 fixtures/weather_v5.json을 ETag와 함께 제공하는 로컬 서버(응답 지연 STUB_DELAY_S)를 띄워
+# 캐시 없는 요청 / TTL 적중 / 304 재검증 / 동시 요청 병합 / 디스크 캐시 재사용을 측정합니다.
+# -------------------------------
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+
+import requests
+
+from weather_client import WeatherClient
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "weather_v5.json")
+STUB_DELAY_S = 0.2    # 실제 API 응답 시간을 흉내 내는 지연
+
+with open(FIXTURE_PATH, "rb") as f:
+    BODY = f.read()
+ETAG = '"' + hashlib.sha1(BODY).hexdigest() + '"'
+STUB_REQUESTS = {"200": 0, "304": 0}
+_stub_lock = threading.Lock()
+
+
+class WeatherStubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(STUB_DELAY_S)
+        not_modified = self.headers.get("If-None-Match") == ETAG
+        with _stub_lock:
+            STUB_REQUESTS["304" if not_modified else "200"] += 1
+        if not_modified:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def timed(label, call):
+    started = perf_counter()
+    result = call()
+    print(f"⏱ {label:24s}: {(perf_counter() - started) * 1000:7.1f}ms")
+    return result
+
+
+if __name__ == "__main__":
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WeatherStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/api_v2/weather_v5.cgi?loc=4684033000&language=ko"
+    cache_dir = tempfile.mkdtemp(prefix="weather_cache_")
+
+    try:
+        # 기존 방식: 세션 · 캐시 없이 매번 요청
+        timed("캐시 없음 (requests.get)", lambda: requests.get(url, timeout=10).json())
+
+        client = WeatherClient(ttl=60, cache_dir=cache_dir)
+        payload = timed("첫 요청 (미스)", lambda: client.get_json(url))
+        assert payload == requests.get(url, timeout=10).json()
+        timed("TTL 이내 (적중)", lambda: client.get_json(url))
+
+        # TTL 만료 → ETag 조건부 요청 → 304
+        client.ttl = 0
+        timed("TTL 만료 (304 재검증)", lambda: client.get_json(url))
+        assert STUB_REQUESTS["304"] == 1
+
+        # 빈 캐시에 동시 요청: 네트워크 요청은 한 번
+        STUB_REQUESTS["200"] = 0
+        cold = WeatherClient(ttl=60)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = timed(f"동시 요청 {concurrency}개", lambda: list(executor.map(cold.get_json, [url] * concurrency)))
+        assert all(result is results[0] for result in results) and STUB_REQUESTS["200"] == 1
+        print(f"🔗 동시 요청 병합: {cold.metrics()['coalesced']}개 요청이 첫 요청 결과를 공유")
+
+        # 새 프로세스(새 클라이언트)에서 디스크 캐시 재사용
+        restarted = WeatherClient(ttl=60, cache_dir=cache_dir)
+        timed("재시작 후 (디스크 캐시)", lambda: restarted.get_json(url))
+        assert restarted.metrics()["hits"] == 1 and restarted.metrics()["fetches"] == 0
+
+        print("📊 클라이언트 지표:", client.metrics())
+        print("📡 스텁 서버 요청 수:", STUB_REQUESTS)
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
@@ -0,0 +1,141 @@
+# -------------------------------
+# 날씨 API 응답 파서 검증 및 성능 비교 (기존 날짜별 hourly 전체 스캔 vs weather_parser)
+# 사용법: python bench_weather_parser.py [반복 횟수]
+# fixtures/weather_v5.json 으로 하루 평균 풍속이 기존 방식과 같은지 확인한 뒤 두 가지를 측정합니다.
+# 1) 같은 작업: 날짜별 스캔 방식으로 새 방식과 같은 집계(5개 항목 × 오전/오후 · 하루 평균, 최저/최고)를 만들어
+#    결과가 같은지 확인하고 단일 패스 집계와 시간 비교 (hourly를 7일 / 14일치로 늘린 응답 포함)
+# 2) 기존 화면 결과물: 기존 fetch_weather_preview(풍속 평균만 계산)와 새 일별 행 생성(모든 항목 집계) —
+#    새 방식이 하는 일이 더 많으므로 참고용
+# 새 방식에만 있는 시간별 저장 행(hourly_weather_forecast) 생성 시간은 따로 표시합니다.
+# -------------------------------
+import copy
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from weather_parser import (EXTREMES, HOURLY_COLUMNS, PM_START_HOUR, aggregate_hourly, build_daily_rows, hourly_rows,
+                            parse_hourly)
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "weather_v5.json")
+
+# 기존 fetch_weather_preview: 날짜마다 hourly 목록 전체를 startswith로 스캔하여 풍속 평균 → 일별 행
+def legacy_daily_rows(data):
+    current_wind_raw = data.get("detailinfo", {}).get("wspd", {}).get("value", "-")
+    try:
+        current_wind = f"{float(current_wind_raw):.1f}"
+    except:
+        current_wind = "-"
+    results = []
+    for entry in data.get("daily", [])[:7]:
+        date_key = entry["TimeLocal"].split("T")[0]
+        wind_list = [float(h["wspd"]) for h in data.get("hourly", []) if h["TimeLocal"].startswith(date_key)]
+        avg_wind = f"{sum(wind_list)/len(wind_list):.1f}" if wind_list else current_wind
+        results.append({
+            "date": date_key,
+            "am_temp": entry["mint"],
+            "pm_temp": entry["maxt"],
+            "am_rain": entry["pop"],
+            "pm_rain": entry["pop"],
+            "am_wind": avg_wind,
+            "pm_wind": avg_wind,
+            "am_sky": entry["day_cmt"],
+            "pm_sky": entry["night_cmt"]
+        })
+    return results
+
+# 같은 작업을 날짜별 스캔으로: 날짜마다 hourly 전체를 startswith로 훑어 항목별 오전/오후 값을 모아 집계
+def scan_aggregates(data):
+    parsed = parse_hourly(data)
+    days = sorted({at[:10] for at in parsed["at"]})
+    aggregates = {"day": days}
+    for column in HOURLY_COLUMNS:
+        values = parsed[column]
+        am, pm, mean = [], [], []
+        extremes = {name: ([], [], []) for extreme_column, name in EXTREMES if extreme_column == column}
+        for day in days:
+            halves = ([], [])
+            for at, value in zip(parsed["at"], values):
+                if at.startswith(day) and value is not None:
+                    halves[int(at[11:13]) >= PM_START_HOUR].append(value)
+            am.append(sum(halves[0]) / len(halves[0]) if halves[0] else None)
+            pm.append(sum(halves[1]) / len(halves[1]) if halves[1] else None)
+            both = halves[0] + halves[1]
+            mean.append(sum(both) / len(both) if both else None)
+            for name, (whole, am_extreme, pm_extreme) in extremes.items():
+                reducer = min if name == "min" else max
+                am_extreme.append(reducer(halves[0]) if halves[0] else None)
+                pm_extreme.append(reducer(halves[1]) if halves[1] else None)
+                whole.append(reducer(both) if both else None)
+        aggregates.update({f"{column}_am": am, f"{column}_pm": pm, f"{column}_mean": mean})
+        for name, (whole, am_extreme, pm_extreme) in extremes.items():
+            aggregates.update({f"{column}_{name}": whole, f"{column}_{name}_am": am_extreme,
+                               f"{column}_{name}_pm": pm_extreme})
+    return aggregates
+
+def grouped_aggregates(data):
+    return aggregate_hourly(parse_hourly(data))
+
+def same_aggregates(left, right):
+    return left.keys() == right.keys() and all(
+        left[key] == right[key] if key == "day" else
+        all((a is None and b is None) or (a is not None and b is not None and abs(a - b) < 1e-9)
+            for a, b in zip(left[key], right[key]))
+        for key in left)
+
+# 새 방식: 파싱 + 일별/오전·오후 집계 → 일별 행
+def grouped_daily_rows(data):
+    return build_daily_rows(data, aggregate_hourly(parse_hourly(data)))
+
+# hourly를 hours시간으로 늘린 응답 (원래 시간별 값을 반복, 시각만 이어 붙임)
+def extend_hourly(data, hours):
+    extended = copy.deepcopy(data)
+    source = data["hourly"]
+    start = datetime.fromisoformat(source[0]["TimeLocal"][:19])
+    extended["hourly"] = [dict(source[i % len(source)], TimeLocal=(start + timedelta(hours=i)).isoformat())
+                          for i in range(hours)]
+    return extended
+
+def timeit(func, data, repeat):
+    started = perf_counter()
+    for _ in range(repeat):
+        func(data)
+    return (perf_counter() - started) / repeat
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        data = json.load(f)[0]
+
+    legacy = legacy_daily_rows(data)
+    rows = grouped_daily_rows(data)
+    aggregates = aggregate_hourly(parse_hourly(data))
+    daily_means = dict(zip(aggregates["day"], aggregates["wind_speed_ms_mean"]))
+    assert [row["date"] for row in legacy] == [row["date"] for row in rows]
+    for old, new in zip(legacy, rows):
+        if old["date"] in daily_means:
+            assert old["am_wind"] == f"{daily_means[old['date']]:.1f}"
+        else:
+            assert new["am_wind"] == old["am_wind"]    # 시간별 예보가 없는 날짜는 현재 풍속
+    print(f"✅ 일별 풍속 평균 일치 ({len(daily_means)}일, 시간별 {len(data['hourly'])}행)")
+
+    payloads = (("fixture", data), ("7일", extend_hourly(data, 24 * 7)), ("14일", extend_hourly(data, 24 * 14)))
+    print("⏱ 같은 집계 (파싱 포함): 날짜별 스캔 vs 단일 패스")
+    for label, payload in payloads:
+        assert same_aggregates(scan_aggregates(payload), grouped_aggregates(payload))
+        scan_s = timeit(scan_aggregates, payload, repeat)
+        grouped_s = timeit(grouped_aggregates, payload, repeat)
+        print(f"  {label:7s} (시간별 {len(payload['hourly']):3d}행): 날짜별 스캔 {scan_s * 1000:.3f}ms, "
+              f"단일 패스 {grouped_s * 1000:.3f}ms (단일 패스가 {scan_s / grouped_s:.2f}배 빠름)")
+
+    print("⏱ 참고 — 일별 행 생성: 기존(풍속 평균만) vs 새 방식(모든 항목 집계, 하는 일이 더 많음)")
+    for label, payload in payloads:
+        legacy_s = timeit(legacy_daily_rows, payload, repeat)
+        grouped_s = timeit(grouped_daily_rows, payload, repeat)
+        print(f"  {label:7s} (시간별 {len(payload['hourly']):3d}행): 기존 {legacy_s * 1000:.3f}ms, "
+              f"새 방식 {grouped_s * 1000:.3f}ms")
+
+    parsed = parse_hourly(data)
+    hourly_s = timeit(lambda _: hourly_rows("muan", parsed, None), data, repeat)
+    print(f"⏱ 추가 작업 — 시간별 저장 행 {len(parsed['at'])}개 생성: {hourly_s * 1000:.3f}ms (기존 방식에는 없음)")
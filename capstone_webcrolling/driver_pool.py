@@ -0,0 +1,142 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# -------------------------------
+# WebDriver 세션 풀
+# -------------------------------
+# 크롤링마다 Chrome을 새로 띄우지 않도록 미리 띄워 둔 세션을 재사용합니다.
+# - max_size   : 동시에 존재할 수 있는 브라우저 수 (초과 요청은 대기)
+# - max_uses   : 세션당 최대 사용 횟수 (초과 시 폐기 후 새로 생성)
+# - idle_timeout: 이 시간(초) 이상 쉬고 있는 세션은 evict_idle()에서 종료
+# 사용 중 예외가 발생한 세션은 상태를 신뢰할 수 없으므로 반납 시 폐기합니다.
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.page_ready = False  # 대상 페이지가 이미 로드되어 폼만 재설정하면 되는지 여부
+
+
+class DriverPool:
+    def __init__(self, factory, max_size=2, max_uses=50, idle_timeout=600):
+        self._factory = factory
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {"created": 0, "reused": 0, "discarded": 0, "evicted": 0, "wait_seconds": 0.0}
+
+    # 세션 대여: 유휴 세션이 있으면 재사용, 없으면 한도 내에서 생성, 한도 초과 시 대기
+    # 대기 시간은 첫 시도부터 세션(또는 생성 자리)을 얻을 때까지를 대여당 한 번만 기록 (상태 점검 실패로 다시 시도해도 중복 합산하지 않음)
+    def acquire(self, timeout=None):
+        started = time.monotonic()
+        while True:
+            session = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("WebDriver 풀이 이미 종료되었습니다.")
+                    if self._idle:
+                        session = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = None if timeout is None else timeout - (time.monotonic() - started)
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"WebDriver 세션 대기 시간 초과 ({timeout}초)")
+                    self._cond.wait(remaining)
+                waited = time.monotonic() - started
+
+            if session is None:
+                try:
+                    session = PooledDriver(self._factory())
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self.stats["created"] += 1
+                    self.stats["wait_seconds"] += waited
+                return session
+
+            if self._is_healthy(session):
+                with self._cond:
+                    self.stats["reused"] += 1
+                    self.stats["wait_seconds"] += waited
+                return session
+            self._discard(session)
+
+    # 세션 반납: 오류가 났거나 사용 횟수를 넘긴 세션은 폐기
+    def release(self, session, broken=False):
+        session.uses += 1
+        session.last_used = time.monotonic()
+        if broken or self._closed or session.uses >= self.max_uses:
+            self._discard(session)
+            return
+        with self._cond:
+            self._idle.append(session)
+            self._cond.notify()
+
+    @contextmanager
+    def session(self, timeout=None):
+        session = self.acquire(timeout)
+        broken = False
+        try:
+            yield session
+        except BaseException:
+            broken = True
+            raise
+        finally:
+            self.release(session, broken)
+
+    # 미리 세션을 띄워 첫 요청의 브라우저 기동 비용을 없앰
+    def warm_up(self, count=1):
+        sessions = [self.acquire() for _ in range(min(count, self.max_size))]
+        for session in sessions:
+            session.uses -= 1  # 워밍업은 사용 횟수에 포함하지 않음
+            self.release(session)
+
+    # 유휴 시간이 초과된 세션 종료 (스케줄러에서 주기적으로 호출)
+    def evict_idle(self):
+        now = time.monotonic()
+        with self._cond:
+            expired = [s for s in self._idle if now - s.last_used >= self.idle_timeout]
+            self._idle = [s for s in self._idle if s not in expired]
+            self.stats["evicted"] += len(expired)
+        for session in expired:
+            self._discard(session, counted=False)
+        return len(expired)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for session in idle:
+            self._discard(session, counted=False)
+
+    def _is_healthy(self, session):
+        try:
+            session.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, session, counted=True):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            if counted:
+                self.stats["discarded"] += 1
+            self._cond.notify()
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# toEnergy 표 텍스트 파서
+# -------------------------------
+# "0시 발전량 누적 일사량 기온 풍속 (내일)발전량 누적 일사량 기온 풍속" 형식의 행 텍스트를
+# 행 단위 파이썬 반복 없이 한 번에 열 단위 배열로 변환합니다.
+# '-'(미관측)와 숫자가 아닌 값은 NaN으로 처리하고, 시각은 datetime64로 바로 계산합니다.
+
+TABLE_COLUMNS = [
+    "powergen", "cumulative", "irradiance", "temperature", "wind",
+    "fcst_powergen", "fcst_cumulative", "fcst_irradiance", "fcst_temperature", "fcst_wind"
+]
+TODAY_COLUMNS = ["powergen", "cumulative", "irradiance", "temperature", "wind"]
+TOMORROW_COLUMNS = ["fcst_irradiance", "fcst_temperature", "fcst_wind"]
+FRAME_COLUMNS = [
+    "datetime", "powergen", "cumulative", "irradiance", "temperature", "wind",
+    "fcst_irradiance", "fcst_temperature", "fcst_wind"
+]
+ROW_WIDTH = 1 + len(TABLE_COLUMNS)
+
+def parse_energy_text(text, day):
+    lines = text.strip().split("\n") if isinstance(text, str) else text
+    return parse_energy_lines(lines, day)
+
+# 행 텍스트 → {"hour", "today_at", "tomorrow_at", 각 측정 열} 배열 묶음
+def parse_energy_lines(lines, day):
+    # 시간 셀("0시" ~ "23시")로 시작하는 행만 데이터 행으로 사용 (헤더 행 제외)
+    rows = [parts[:ROW_WIDTH] for parts in (line.split() for line in lines)
+            if len(parts) >= ROW_WIDTH and parts[0][:-1].isdigit()]
+    cells = np.array(rows, dtype=object).reshape(len(rows), ROW_WIDTH)
+
+    hours = np.char.rstrip(cells[:, 0].astype(str), "시").astype(np.int64)
+    values = pd.to_numeric(pd.Series(cells[:, 1:].ravel()), errors="coerce").to_numpy(dtype=np.float64)
+    values = values.reshape(len(rows), len(TABLE_COLUMNS))
+
+    base = np.datetime64(pd.Timestamp(day).date(), "D")
+    offsets = hours.astype("timedelta64[h]")
+    parsed = {
+        "hour": hours,
+        "today_at": (base + offsets).astype("datetime64[ns]"),
+        "tomorrow_at": (base + np.timedelta64(1, "D") + offsets).astype("datetime64[ns]")
+    }
+    for i, column in enumerate(TABLE_COLUMNS):
+        parsed[column] = values[:, i]
+    return parsed
+
+# 파싱 결과 → (오늘 실측, 내일 예보) DataFrame, 결측은 0.0으로 채움
+def to_frames(parsed):
+    n = len(parsed["hour"])
+    zeros = np.zeros(n)
+
+    today = {"datetime": parsed["today_at"]}
+    tomorrow = {"datetime": parsed["tomorrow_at"]}
+    for column in FRAME_COLUMNS[1:]:
+        today[column] = parsed[column] if column in TODAY_COLUMNS else zeros
+        tomorrow[column] = parsed[column] if column in TOMORROW_COLUMNS else zeros
+
+    df_today = pd.DataFrame(today, columns=FRAME_COLUMNS).fillna(0.0)
+    df_tomorrow = pd.DataFrame(tomorrow, columns=FRAME_COLUMNS).fillna(0.0)
+    return df_today, df_tomorrow
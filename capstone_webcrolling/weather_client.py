@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from time import perf_counter
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# -------------------------------
+# 날씨 API(weathernews) 클라이언트: TTL 캐시 + 조건부 요청
+# -------------------------------
+# - 세션 재사용 (호스트당 pool_size개 연결 유지, 일시적 5xx는 재시도), 요청마다 timeout 적용
+# - TTL 캐시: ttl초 이내의 같은 URL 요청은 네트워크 없이 저장된 응답을 반환
+# - 디스크 캐시: cache_dir을 주면 URL별 JSON 파일로 저장하여 다른 작업자 프로세스 · 재시작 후에도 재사용
+# - 재검증: TTL이 지난 항목은 ETag / Last-Modified로 조건부 요청, 304면 본문 없이 저장된 응답의 TTL만 갱신
+# - single-flight: 같은 URL을 동시에 요청하면 첫 요청만 네트워크로 보내고 나머지는 그 결과를 함께 받음
+# - metrics(): 적중/미스/재검증/병합/오류 횟수와 네트워크 요청 지연 시간
+# 반환하는 응답 객체는 캐시와 공유되므로 호출한 쪽에서 수정하지 않습니다.
+
+
+class WeatherClient:
+    def __init__(self, ttl=600, cache_dir=None, timeout=10, pool_size=4, retries=2):
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": "Mozilla/5.0"})
+
+        self._lock = threading.Lock()
+        self._entries = {}     # url → {"payload", "etag", "last_modified", "fetched_at"}
+        self._inflight = {}    # url → 진행 중인 요청의 Future
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "coalesced": 0, "errors": 0,
+                       "fetches": 0, "fetch_total_s": 0.0, "fetch_max_s": 0.0}
+
+    def get_json(self, url):
+        with self._lock:
+            entry = self._lookup(url)
+            if entry is not None and time.time() - entry["fetched_at"] < self.ttl:
+                self._stats["hits"] += 1
+                return entry["payload"]
+            future = self._inflight.get(url)
+            leader = future is None
+            if leader:
+                future = self._inflight[url] = Future()
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            return future.result()    # 먼저 보낸 요청이 실패하면 같은 예외를 받음
+
+        try:
+            payload = self._fetch(url, entry)
+            future.set_result(payload)
+            return payload
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(url, None)
+
+    # 메모리 항목이 없거나 만료됐으면 디스크 항목 확인 (다른 프로세스가 더 최근에 받아 둔 응답 사용)
+    def _lookup(self, url):
+        entry = self._entries.get(url)
+        if entry is None or time.time() - entry["fetched_at"] >= self.ttl:
+            stored = self._load(url)
+            if stored is not None and (entry is None or stored["fetched_at"] > entry["fetched_at"]):
+                entry = self._entries[url] = stored
+        return entry
+
+    def _fetch(self, url, entry):
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        started = perf_counter()
+        res = self.session.get(url, headers=headers, timeout=self.timeout)
+        if res.status_code == 304 and entry is None:
+            # 저장된 응답 없이 304를 받으면 (다른 프로세스가 캐시 파일을 지운 경우 등) 조건 없이 다시 요청
+            res = self.session.get(url, timeout=self.timeout, headers={"Cache-Control": "no-cache"})
+            if res.status_code == 304:
+                raise requests.HTTPError(f"304 응답만 반환되어 본문을 받을 수 없음: {url}", response=res)
+        if res.status_code == 304 and entry is not None:
+            entry = dict(entry, fetched_at=time.time())
+            outcome = "revalidated"
+        else:
+            res.raise_for_status()
+            entry = {
+                "payload": res.json(),
+                "etag": res.headers.get("ETag"),
+                "last_modified": res.headers.get("Last-Modified"),
+                "fetched_at": time.time()
+            }
+            outcome = "misses"
+        elapsed = perf_counter() - started
+
+        with self._lock:
+            self._entries[url] = entry
+            self._stats[outcome] += 1
+            self._stats["fetches"] += 1
+            self._stats["fetch_total_s"] += elapsed
+            self._stats["fetch_max_s"] = max(self._stats["fetch_max_s"], elapsed)
+        self._save(url, entry)
+        return entry["payload"]
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _load(self, url):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return stored if stored.get("url") == url else None
+
+    # 임시 파일에 쓴 뒤 교체하여 다른 프로세스가 쓰다 만 파일을 읽지 않도록 함
+    def _save(self, url, entry):
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(dict(entry, url=url), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def metrics(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+        lookups = snapshot["hits"] + snapshot["misses"] + snapshot["revalidated"] + snapshot["coalesced"]
+        snapshot["hit_ratio"] = round((snapshot["hits"] + snapshot["coalesced"]) / lookups, 3) if lookups else None
+        snapshot["fetch_avg_s"] = round(snapshot["fetch_total_s"] / snapshot["fetches"], 4) if snapshot["fetches"] else None
+        snapshot["fetch_total_s"] = round(snapshot["fetch_total_s"], 4)
+        snapshot["fetch_max_s"] = round(snapshot["fetch_max_s"], 4)
+        snapshot["ttl_s"] = self.ttl
+        return snapshot
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,142 @@
+from datetime import datetime
+
+# -------------------------------
+# 날씨 API(weathernews) 응답 파서
+# -------------------------------
+# hourly 목록을 열마다 한 번 순회하여 열 단위 리스트(시각 문자열, 값 float)로 변환하고,
+# 한 번 더 순회하며 날짜 × 오전/오후 그룹별 합계·개수·최저·최고를 누적하여 일별 · 오전/오후 평균을 함께 계산합니다.
+# (기존 방식은 날짜마다 hourly 목록 전체를 다시 스캔 — 날짜 수 × 시간 수)
+# 응답 길이가 수십~수백 행이므로 numpy 배열 변환 없이 리스트로 누적합니다 (이 크기에서는 배열 변환 비용이 더 큼).
+# 응답에 없는 항목과 숫자가 아닌 값은 None으로 처리합니다 (집계에서 제외).
+
+# API 항목 → 저장 열 이름
+HOURLY_FIELDS = {
+    "temp": "temperature_c",
+    "wspd": "wind_speed_ms",
+    "pop": "precip_prob",
+    "rhum": "humidity_pct",
+    "prec": "precip_mm"
+}
+HOURLY_COLUMNS = list(HOURLY_FIELDS.values())
+PM_START_HOUR = 12    # 12시부터 오후
+FORECAST_DAYS = 7
+EXTREMES = (("temperature_c", "min"), ("temperature_c", "max"), ("precip_prob", "max"))
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+# hourly 목록 → {"at": 시각 문자열 리스트, 열 이름: float 또는 None 리스트}
+# 시각 문자열은 앞 19자(YYYY-MM-DDTHH:MM:SS)만 사용 (시간대 표기 제외, 현지 시각 기준),
+# datetime 변환은 저장 행을 만들 때만 (집계는 문자열의 날짜 · 시 부분으로)
+def parse_hourly(data):
+    entries = data.get("hourly", [])
+    parsed = {"at": [entry["TimeLocal"][:19] for entry in entries]}
+    for field, column in HOURLY_FIELDS.items():
+        values = []
+        for entry in entries:
+            try:
+                values.append(float(entry[field]))
+            except (KeyError, TypeError, ValueError):
+                values.append(None)
+        parsed[column] = values
+    return parsed
+
+# 날짜별 오전/오후 · 하루 평균 (None 제외)과 하루 최저/최고
+# 반환: {"day": 날짜 문자열 리스트, "<열>_am", "<열>_pm", "<열>_mean", 기온 최저/최고 · 강수확률 최고 ("_am", "_pm" 포함)}
+# 값이 없는 그룹은 None
+def aggregate_hourly(parsed):
+    groups = {}    # 날짜 → (오전, 오후) 각각 {열: [합계, 개수, 최저, 최고]}
+    columns = [(column, parsed[column]) for column in HOURLY_COLUMNS]
+    for i, at in enumerate(parsed["at"]):
+        day = at[:10]
+        halves = groups.get(day)
+        if halves is None:
+            halves = groups[day] = ({}, {})
+        half = halves[int(at[11:13]) >= PM_START_HOUR]
+        for column, values in columns:
+            value = values[i]
+            if value is None:
+                continue
+            acc = half.get(column)
+            if acc is None:
+                half[column] = [value, 1, value, value]
+            else:
+                acc[0] += value
+                acc[1] += 1
+                if value < acc[2]:
+                    acc[2] = value
+                if value > acc[3]:
+                    acc[3] = value
+
+    days = sorted(groups)
+    aggregates = {"day": days}
+    for column in HOURLY_COLUMNS:
+        am, pm, mean = [], [], []
+        for day in days:
+            first, second = (half.get(column) for half in groups[day])
+            am.append(first[0] / first[1] if first else None)
+            pm.append(second[0] / second[1] if second else None)
+            both = [acc for acc in (first, second) if acc]
+            mean.append(sum(acc[0] for acc in both) / sum(acc[1] for acc in both) if both else None)
+        aggregates[f"{column}_am"] = am
+        aggregates[f"{column}_pm"] = pm
+        aggregates[f"{column}_mean"] = mean
+
+    for column, name in EXTREMES:
+        position, reducer = (2, min) if name == "min" else (3, max)
+        am, pm, whole = [], [], []
+        for day in days:
+            first, second = (half.get(column) for half in groups[day])
+            am.append(first[position] if first else None)
+            pm.append(second[position] if second else None)
+            both = [value for value in (am[-1], pm[-1]) if value is not None]
+            whole.append(reducer(both) if both else None)
+        aggregates[f"{column}_{name}"] = whole
+        aggregates[f"{column}_{name}_am"] = am
+        aggregates[f"{column}_{name}_pm"] = pm
+    return aggregates
+
+def _format(value, fallback):
+    return fallback if value is None else f"{value:.1f}"
+
+def _percent(value, fallback):
+    return fallback if value is None else f"{value:.0f}"
+
+# daily 목록(최대 7일) + 시간별 집계 → daily_weather_forecast 저장 / 화면 표시용 행
+# 기온 최저/최고 · 하늘 상태 · 하루 강수확률은 API의 일별 값, 풍속(평균) · 오전/오후 강수확률(최고)은 시간별 집계
+# (시간별 예보가 없는 날짜는 풍속은 현재 풍속, 강수확률은 일별 값 사용)
+def build_daily_rows(data, aggregates):
+    current_wind = _format(_to_float(data.get("detailinfo", {}).get("wspd", {}).get("value")), "-")
+    positions = {day: i for i, day in enumerate(aggregates["day"])}
+
+    rows = []
+    for entry in data.get("daily", [])[:FORECAST_DAYS]:
+        date_key = entry["TimeLocal"].split("T")[0]
+        i = positions.get(date_key)
+        hourly_value = (lambda key: aggregates[key][i]) if i is not None else (lambda key: None)
+        rows.append({
+            "date": date_key,
+            "am_temp": entry["mint"],
+            "pm_temp": entry["maxt"],
+            "rain": entry["pop"],
+            "am_rain": _percent(hourly_value("precip_prob_max_am"), entry["pop"]),
+            "pm_rain": _percent(hourly_value("precip_prob_max_pm"), entry["pop"]),
+            "am_wind": _format(hourly_value("wind_speed_ms_am"), current_wind),
+            "pm_wind": _format(hourly_value("wind_speed_ms_pm"), current_wind),
+            "am_sky": entry["day_cmt"],
+            "pm_sky": entry["night_cmt"]
+        })
+    return rows
+
+# 시간별 열 → hourly_weather_forecast upsert 파라미터 (None은 NULL)
+def hourly_rows(site_id, parsed, issued_at):
+    times = [datetime.fromisoformat(at) for at in parsed["at"]]
+    columns = [[None if value is None else round(value, 2) for value in parsed[column]] for column in HOURLY_COLUMNS]
+    return [(site_id, at, *values, issued_at) for at, *values in zip(times, *columns)]
+
+def parse_weather(data):
+    parsed = parse_hourly(data)
+    return build_daily_rows(data, aggregate_hourly(parsed)), parsed